@@ -4,10 +4,12 @@ Automated Daily Stock Sentiment Analysis Runner
 Runs comprehensive analysis and saves results for historical tracking
 """
 
+import atexit
 import logging
+import queue
 import sys
 import os
-import json
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime, timedelta
 import asyncio
@@ -16,23 +18,37 @@ import asyncio
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
+from src.data.models import DailyResult
+from src.utils.helpers import dump_json, load_json, scan_daily_results
+
 # Configure logging
 def setup_logging():
-    """Setup logging with daily rotation"""
+    """Setup logging with daily rotation
+    
+    Records are queued by the root logger and written to the file and console
+    by a background listener thread, so logging never blocks the event loop.
+    """
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
     
     today = datetime.now().strftime("%Y%m%d")
     log_file = log_dir / f"daily_analysis_{today}.log"
     
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue,
+        logging.FileHandler(log_file, encoding='utf-8'),
+        logging.StreamHandler(),
+        respect_handler_level=True
+    )
+    
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
+        handlers=[QueueHandler(log_queue)]
     )
+    listener.start()
+    atexit.register(listener.stop)
     return logging.getLogger(__name__)
 
 def save_daily_results(results, date_str):
@@ -42,24 +58,23 @@ def save_daily_results(results, date_str):
     
     results_file = results_dir / f"analysis_{date_str}.json"
     
-    # Convert results to JSON-serializable format
-    json_results = {
-        'date': date_str,
-        'timestamp': datetime.now().isoformat(),
-        'analysis_mode': results.get('mode', 'comprehensive'),
-        'total_posts': results.get('total_posts', 0),
-        'total_stocks': results.get('total_stocks', 0),
-        'average_confidence': results.get('average_confidence', 0),
-        'top_rankings': results.get('rankings', [])[:10],  # Top 10 only
-        'sentiment_distribution': results.get('sentiment_distribution', {}),
-        'confidence_breakdown': results.get('confidence_breakdown', {}),
-        'data_sources': results.get('sources', {}),
-        'backtesting_accuracy': results.get('backtesting_accuracy', 0),
-        'total_mentions': results.get('total_mentions', 0)
-    }
-    
-    with open(results_file, 'w') as f:
-        json.dump(json_results, f, indent=2)
+    # Convert results to a fixed-shape record that orjson serializes directly
+    daily_result = DailyResult(
+        date=date_str,
+        timestamp=datetime.now().isoformat(),
+        analysis_mode=results.get('mode', 'comprehensive'),
+        total_posts=results.get('total_posts', 0),
+        total_stocks=results.get('total_stocks', 0),
+        average_confidence=results.get('average_confidence', 0),
+        top_rankings=results.get('rankings', [])[:10],  # Top 10 only
+        sentiment_distribution=results.get('sentiment_distribution', {}),
+        confidence_breakdown=results.get('confidence_breakdown', {}),
+        data_sources=results.get('sources', {}),
+        backtesting_accuracy=results.get('backtesting_accuracy', 0),
+        total_mentions=results.get('total_mentions', 0)
+    )
+    
+    dump_json(daily_result, results_file)
     
     return results_file
 
@@ -81,23 +96,27 @@ async def run_daily_analysis():
         logger.info("Running comprehensive analysis...")
         results = await analyzer.run_analysis(collection_mode='comprehensive')
         
+        # Accumulate mention and confidence totals in a single pass
+        results = results or []
+        total_mentions = 0
+        confidence_sum = 0
+        for stock in results:
+            total_mentions += stock.get('total_mentions', 0)
+            confidence_sum += stock.get('confidence_score', 0)
+        
         # Convert results to our expected format
         formatted_results = {
             'mode': 'comprehensive',
             'date': date_str,
-            'total_stocks': len(results) if results else 0,
+            'total_stocks': len(results),
             'total_posts': 116,  # From the log output
-            'total_mentions': sum(stock.get('total_mentions', 0) for stock in results) if results else 0,
-            'average_confidence': sum(stock.get('confidence_score', 0) for stock in results) / len(results) if results else 0,
-            'rankings': results or [],
+            'total_mentions': total_mentions,
+            'average_confidence': confidence_sum / len(results) if results else 0,
+            'rankings': results,
             'sources': {'reddit': True, 'twitter': False},
             'backtesting_accuracy': 0  # Will be calculated separately
         }
         
-        # Add additional metadata
-        formatted_results['mode'] = 'comprehensive'
-        formatted_results['date'] = date_str
-        
         # Save results
         results_file = save_daily_results(formatted_results, date_str)
         logger.info(f"Results saved to: {results_file}")
@@ -152,7 +171,16 @@ async def run_daily_analysis():
         logger.error(f"❌ Daily analysis failed: {e}")
         raise
 
+async def load_results_files(paths):
+    """Load daily result files concurrently without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*[loop.run_in_executor(None, load_json, path) for path in paths])
+
 def create_summary_report():
+    """Create a summary report of recent daily runs"""
+    return asyncio.run(create_summary_report_async())
+
+async def create_summary_report_async():
     """Create a summary report of recent daily runs"""
     results_dir = Path("daily_results")
     if not results_dir.exists():
@@ -160,65 +188,67 @@ def create_summary_report():
         return
     
     # Get all result files from last 7 days
-    seven_days_ago = datetime.now() - timedelta(days=7)
+    cutoff_stem = (datetime.now() - timedelta(days=7)).strftime("%Y%m%d")
     recent_files = []
     
-    for file in results_dir.glob("analysis_*.json"):
-        try:
-            date_str = file.stem.split('_')[1]
-            file_date = datetime.strptime(date_str, "%Y%m%d")
-            if file_date >= seven_days_ago:
-                recent_files.append((file_date, file))
-        except:
+    # Entries come back sorted by name, which is also date order, so walk them
+    # newest first and stop at the first file older than the cutoff
+    for entry in reversed(scan_daily_results(results_dir)):
+        date_str = entry.name[len('analysis_'):-len('.json')]
+        if len(date_str) != 8 or not date_str.isdigit():
             continue
+        if date_str <= cutoff_stem:
+            break
+        recent_files.append((f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}", entry.path))
+    recent_files.reverse()
     
     if not recent_files:
         print("No recent analysis files found")
         return
     
-    # Sort by date
-    recent_files.sort(key=lambda x: x[0])
-    
     print("\n📊 WEEKLY ANALYSIS SUMMARY")
     print("="*60)
     
-    all_stocks = {}  # Track stock performance over time
+    rows = []  # Track stock performance over time
     
-    for file_date, file_path in recent_files:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
-        print(f"\n📅 {file_date.strftime('%Y-%m-%d')}:")
+    loaded = await load_results_files([file_path for _, file_path in recent_files])
+    
+    for (file_date, _), data in zip(recent_files, loaded):
+        print(f"\n📅 {file_date}:")
         print(f"   Stocks: {data.get('total_stocks', 0)} | "
               f"Posts: {data.get('total_posts', 0)} | "
               f"Avg Confidence: {data.get('average_confidence', 0):.3f}")
         
         # Track top stocks
-        for stock in data.get('top_rankings', [])[:3]:
-            symbol = stock.get('symbol', 'Unknown')
-            if symbol not in all_stocks:
-                all_stocks[symbol] = []
-            all_stocks[symbol].append({
-                'date': file_date,
-                'score': stock.get('score', 0),
-                'sentiment': stock.get('sentiment', 0),
-                'mentions': stock.get('mentions', 0)
-            })
+        rows.extend({
+            'symbol': stock.get('symbol', 'Unknown'),
+            'date': file_date,
+            'score': stock.get('score', 0),
+            'sentiment': stock.get('sentiment', 0),
+            'mentions': stock.get('mentions', 0)
+        } for stock in data.get('top_rankings', [])[:3])
     
     # Show trending stocks
     print(f"\n📈 TRENDING STOCKS (appeared in top 3 multiple times):")
     print("-" * 60)
-    trending = {k: v for k, v in all_stocks.items() if len(v) > 1}
+    if not rows:
+        return
     
-    for symbol, history in sorted(trending.items(), key=lambda x: len(x[1]), reverse=True):
-        appearances = len(history)
-        avg_score = sum(h['score'] for h in history) / appearances
-        avg_sentiment = sum(h['sentiment'] for h in history) / appearances
-        total_mentions = sum(h['mentions'] for h in history)
-        
-        print(f"   {symbol:>6} | Appearances: {appearances} | "
-              f"Avg Score: {avg_score:.3f} | Avg Sentiment: {avg_sentiment:.3f} | "
-              f"Total Mentions: {total_mentions}")
+    import pandas as pd
+    
+    summary = pd.DataFrame(rows).groupby('symbol', sort=False).agg(
+        appearances=('date', 'size'),
+        avg_score=('score', 'mean'),
+        avg_sentiment=('sentiment', 'mean'),
+        total_mentions=('mentions', 'sum')
+    )
+    trending = summary[summary['appearances'] > 1].sort_values(
+        'appearances', ascending=False, kind='stable')
+    
+    for row in trending.itertuples():
+        print(f"   {row.Index:>6} | Appearances: {row.appearances} | "
+              f"Avg Score: {row.avg_score:.3f} | Avg Sentiment: {row.avg_sentiment:.3f} | "
+              f"Total Mentions: {row.total_mentions}")
 
 if __name__ == "__main__":
     import argparse
@@ -234,8 +264,16 @@ if __name__ == "__main__":
     if args.summary:
         create_summary_report()
     elif args.test:
+        # No log file or handler thread needed for a dry run
+        logging.basicConfig(level=logging.WARNING)
         print("🧪 Test mode - Daily runner would execute here")
-        setup_logging()
     else:
+        # Optional faster event loop - install with: pip install uvloop (not available on Windows)
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+        
         # Run the actual daily analysis
         asyncio.run(run_daily_analysis())
@@ -19,30 +19,40 @@ def check_results():
         print(f"📊 Total Reddit posts scraped: {total_posts}")
         
         # Check posts with stock symbols
-        cursor.execute('SELECT symbols, title, sentiment_compound FROM reddit_posts WHERE symbols != ""')
-        results = cursor.fetchall()
+        posts_with_symbols = 0
+        lines = []
         
-        print(f"\n🎯 Posts mentioning stocks: {len(results)}")
+        for symbols, title, sentiment in cursor.execute(
+                "SELECT symbols, title, sentiment_compound FROM reddit_posts WHERE symbols != ''"):
+            posts_with_symbols += 1
+            lines.append(f"Symbols: {symbols}\n"
+                         f"Title: {title[:70]}...\n"
+                         f"Sentiment: {sentiment:.3f}\n" +
+                         "-" * 40)
+        
+        print(f"\n🎯 Posts mentioning stocks: {posts_with_symbols}")
         print("-" * 80)
+        if lines:
+            print("\n".join(lines))
+        
+        # Split the comma-separated symbol lists and count mentions inside sqlite
+        cursor.execute('''
+            WITH RECURSIVE split(symbol, rest) AS (
+                SELECT '', symbols || ',' FROM reddit_posts WHERE symbols != ''
+                UNION ALL
+                SELECT substr(rest, 1, instr(rest, ',') - 1), substr(rest, instr(rest, ',') + 1)
+                FROM split WHERE rest != ''
+            )
+            SELECT symbol, COUNT(*) FROM split
+            WHERE symbol != ''
+            GROUP BY symbol
+            ORDER BY 2 DESC, symbol
+        ''')
+        symbol_counts = cursor.fetchall()
         
-        for symbols, title, sentiment in results:
-            print(f"Symbols: {symbols}")
-            print(f"Title: {title[:70]}...")
-            print(f"Sentiment: {sentiment:.3f}")
-            print("-" * 40)
-        
-        # Check all symbol mentions
-        cursor.execute('SELECT symbols FROM reddit_posts WHERE symbols != ""')
-        all_symbols = []
-        for (symbols_str,) in cursor.fetchall():
-            if symbols_str:
-                all_symbols.extend(symbols_str.split(','))
-        
-        if all_symbols:
-            from collections import Counter
-            symbol_counts = Counter(all_symbols)
+        if symbol_counts:
             print(f"\n📈 Stock symbol mentions:")
-            for symbol, count in symbol_counts.most_common():
+            for symbol, count in symbol_counts:
                 print(f"  ${symbol}: {count} mentions")
         else:
             print("\n❌ No stock symbols found in any posts")
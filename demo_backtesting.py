@@ -8,25 +8,23 @@ import sys
 import sqlite3
 from pathlib import Path
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
 
 # Add src to path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-# Import backtester components directly
-import sqlite3
-import yfinance as yf
-from datetime import datetime, timedelta
+from src.data.price_cache import PriceCache
 
 def demo_backtest():
     """Demonstrate backtesting with current data"""
     print("🔬 Stock Sentiment Backtesting Demo")
     print("=" * 60)
     
-    # Show what data we have
+    # Show what data we have - one connection serves every query below
     conn = sqlite3.connect("data/stock_sentiment.db")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA mmap_size=268435456")
     
     # Get sample of recent data
     query = """
@@ -36,13 +34,12 @@ def demo_backtest():
     LIMIT 10
     """
     
-    recent_data = pd.read_sql_query(query, conn)
     print("\n📊 Recent Sentiment Data Sample:")
     print("-" * 60)
-    for _, row in recent_data.iterrows():
-        print(f"{row['symbol']:>6} | Sentiment: {row['sentiment_compound']:>6.3f} | "
-              f"Mentions: {row['mentions']:>3} | "
-              f"Date: {row['created_at'][:10]}")
+    for symbol, sentiment, mentions, created_at in conn.execute(query):
+        print(f"{symbol:>6} | Sentiment: {sentiment:>6.3f} | "
+              f"Mentions: {mentions:>3} | "
+              f"Date: {created_at[:10]}")
     
     # Get top symbols by mention count
     top_symbols_query = """
@@ -56,79 +53,80 @@ def demo_backtest():
     LIMIT 5
     """
     
-    top_symbols = pd.read_sql_query(top_symbols_query, conn)
+    top_symbols = conn.execute(top_symbols_query).fetchall()
     print(f"\n🏆 Top Symbols by Mentions:")
     print("-" * 60)
-    for _, row in top_symbols.iterrows():
-        print(f"{row['symbol']:>6} | Avg Sentiment: {row['avg_sentiment']:>6.3f} | "
-              f"Total Mentions: {row['total_mentions']:>3} | Records: {row['records']:>2}")
-    
-    conn.close()
+    for symbol, avg_sentiment, total_mentions, records in top_symbols:
+        print(f"{symbol:>6} | Avg Sentiment: {avg_sentiment:>6.3f} | "
+              f"Total Mentions: {total_mentions:>3} | Records: {records:>2}")
     
     # Test with a few specific stocks that have good data
-    test_symbols = top_symbols['symbol'].tolist()[:3]  # Top 3 by mentions
+    test_symbols = [row[0] for row in top_symbols[:3]]  # Top 3 by mentions
     print(f"\n🎯 Testing Sentiment vs Price Performance: {', '.join(test_symbols)}")
     print("-" * 60)
     
-    accurate_predictions = 0
-    total_predictions = 0
+    # Get sentiment for all test symbols in one query
+    placeholders = ','.join('?' * len(test_symbols))
+    sentiment_query = f"""
+    SELECT symbol, AVG(sentiment_compound) as avg_sentiment, 
+           SUM(mentions) as total_mentions
+    FROM symbol_sentiment_history 
+    WHERE symbol IN ({placeholders})
+    GROUP BY symbol
+    """
+    symbol_sentiment = {
+        symbol: (avg_sentiment, total_mentions)
+        for symbol, avg_sentiment, total_mentions in conn.execute(sentiment_query, test_symbols)
+    }
+    conn.close()
+    
+    # Get recent price data for all test symbols, downloading only what isn't cached
+    end_date = datetime.now()
+    closes = PriceCache().get_close_prices(test_symbols, end_date - timedelta(days=30), end_date)
+    
+    # Price change over the window and prediction outcome for every symbol at once
+    if closes.empty:
+        last_close = price_changes = pd.Series(dtype=float)
+    else:
+        first_close = closes.bfill().iloc[0]
+        last_close = closes.ffill().iloc[-1]
+        price_changes = (last_close / first_close - 1) * 100
+    
+    sentiments = pd.Series({symbol: values[0] for symbol, values in symbol_sentiment.items()},
+                           dtype=float).reindex(price_changes.index)
+    bullish = sentiments > 0.1
+    bearish = sentiments < -0.1
+    correct = (bullish & (price_changes > 0)) | (bearish & (price_changes < 0))
+    
+    total_predictions = int((bullish | bearish).sum())  # Only count if we made a prediction
+    accurate_predictions = int(correct.sum())
     
     for symbol in test_symbols:
         print(f"\n📈 Analyzing {symbol}:")
         
-        # Get recent price data
-        try:
-            ticker = yf.Ticker(symbol)
-            price_data = ticker.history(period="1mo")
-            
-            if not price_data.empty:
-                current_price = price_data['Close'].iloc[-1]
-                start_price = price_data['Close'].iloc[0]
-                price_change = ((current_price - start_price) / start_price) * 100
-                
-                print(f"   Price Change (30d): {price_change:+.2f}%")
-                print(f"   Current Price: ${current_price:.2f}")
-                
-                # Get sentiment for this symbol
-                conn = sqlite3.connect("data/stock_sentiment.db")
-                sentiment_query = """
-                SELECT AVG(sentiment_compound) as avg_sentiment, 
-                       SUM(mentions) as total_mentions
-                FROM symbol_sentiment_history 
-                WHERE symbol = ?
-                """
-                result = conn.execute(sentiment_query, (symbol,)).fetchone()
-                conn.close()
-                
-                if result and result[0] is not None:
-                    avg_sentiment = result[0]
-                    total_mentions = result[1]
-                    
-                    print(f"   Avg Sentiment: {avg_sentiment:.3f}")
-                    print(f"   Total Mentions: {total_mentions}")
-                    
-                    # Simple correlation check
-                    prediction_correct = False
-                    if avg_sentiment > 0.1 and price_change > 0:
-                        print("   ✅ Positive sentiment → Positive returns (CORRECT)")
-                        prediction_correct = True
-                    elif avg_sentiment < -0.1 and price_change < 0:
-                        print("   ✅ Negative sentiment → Negative returns (CORRECT)")
-                        prediction_correct = True
-                    elif abs(avg_sentiment) < 0.1:
-                        print("   ➖ Neutral sentiment (no prediction)")
-                    else:
-                        print("   ❌ Sentiment-price mismatch (INCORRECT)")
-                    
-                    if abs(avg_sentiment) > 0.1:  # Only count if we made a prediction
-                        total_predictions += 1
-                        if prediction_correct:
-                            accurate_predictions += 1
-            else:
-                print(f"   ⚠️ No price data available")
-                
-        except Exception as e:
-            print(f"   ❌ Error getting data: {e}")
+        if symbol not in price_changes.index:
+            print(f"   ⚠️ No price data available")
+            continue
+        
+        print(f"   Price Change (30d): {price_changes[symbol]:+.2f}%")
+        print(f"   Current Price: ${last_close[symbol]:.2f}")
+        
+        avg_sentiment = sentiments[symbol]
+        if pd.isna(avg_sentiment):
+            continue
+        
+        print(f"   Avg Sentiment: {avg_sentiment:.3f}")
+        print(f"   Total Mentions: {symbol_sentiment[symbol][1]}")
+        
+        # Simple correlation check
+        if correct[symbol] and bullish[symbol]:
+            print("   ✅ Positive sentiment → Positive returns (CORRECT)")
+        elif correct[symbol]:
+            print("   ✅ Negative sentiment → Negative returns (CORRECT)")
+        elif abs(avg_sentiment) < 0.1:
+            print("   ➖ Neutral sentiment (no prediction)")
+        else:
+            print("   ❌ Sentiment-price mismatch (INCORRECT)")
     
     # Calculate accuracy
     if total_predictions > 0:
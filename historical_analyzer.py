@@ -4,11 +4,15 @@ Historical Data Analyzer
 Analyzes trends and patterns from daily automated runs
 """
 
-import json
+import numpy as np
 import pandas as pd
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
+
+from src.utils.helpers import load_json, scan_daily_results
+
 # Optional plotting libraries - install with: pip install matplotlib seaborn
 try:
     import matplotlib.pyplot as plt
@@ -17,55 +21,105 @@ try:
 except ImportError:
     PLOTTING_AVAILABLE = False
 
-def load_daily_results():
-    """Load all daily results into a DataFrame"""
+METRIC_COLUMNS = ['date', 'timestamp', 'total_posts', 'total_stocks', 'average_confidence',
+                  'total_mentions', 'backtesting_accuracy']
+COUNT_COLUMNS = ['total_posts', 'total_stocks', 'total_mentions']
+RANKING_FIELDS = ['symbol', 'score', 'sentiment', 'mentions']
+LOAD_WORKERS = 8
+
+# Daily payloads from the last load, keyed by the (name, mtime) of every results file
+_PAYLOAD_CACHE = {}
+
+def _load_daily_payload(file):
+    """Load one daily results file, returning None if it can't be read"""
+    try:
+        return load_json(file)
+    except Exception as e:
+        print(f"Error loading {file}: {e}")
+        return None
+
+def _load_daily_payloads():
+    """Load the raw JSON payloads of all daily results"""
     results_dir = Path("daily_results")
     if not results_dir.exists():
+        return []
+    
+    # Reuse the previous load while no file was added, removed or modified
+    entries = scan_daily_results(results_dir)
+    cache_key = tuple((entry.name, entry.stat().st_mtime_ns) for entry in entries)
+    if cache_key in _PAYLOAD_CACHE:
+        return _PAYLOAD_CACHE[cache_key]
+    
+    # Reads are I/O-bound, so overlap them across a small thread pool
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
+        all_data = list(executor.map(_load_daily_payload, [entry.path for entry in entries]))
+    
+    all_data = [data for data in all_data if data is not None]
+    _PAYLOAD_CACHE.clear()
+    _PAYLOAD_CACHE[cache_key] = all_data
+    return all_data
+
+def _build_rankings_frame(all_data):
+    """Flatten the top 5 rankings of every day into one long DataFrame"""
+    records = [{'day': day, 'date': data.get('date'), 'top_rankings': data.get('top_rankings', [])[:5]}
+               for day, data in enumerate(all_data)]
+    rankings = pd.json_normalize(records, record_path='top_rankings', meta=['day', 'date'])
+    rankings = rankings.reindex(columns=['day', 'date'] + RANKING_FIELDS)
+    rankings['symbol'] = rankings['symbol'].fillna('')
+    rankings[RANKING_FIELDS[1:]] = rankings[RANKING_FIELDS[1:]].fillna(0)
+    rankings['rank'] = rankings.groupby('day').cumcount() + 1
+    rankings['date'] = pd.to_datetime(rankings['date'], format='%Y%m%d')
+    return rankings
+
+def load_daily_results():
+    """Load all daily results into a DataFrame"""
+    all_data = _load_daily_payloads()
+    if not all_data:
         return None
     
-    all_data = []
-    
-    for file in results_dir.glob("analysis_*.json"):
-        try:
-            with open(file, 'r') as f:
-                data = json.load(f)
-            
-            # Extract key metrics
-            base_metrics = {
-                'date': data.get('date'),
-                'timestamp': data.get('timestamp'),
-                'total_posts': data.get('total_posts', 0),
-                'total_stocks': data.get('total_stocks', 0),
-                'average_confidence': data.get('average_confidence', 0),
-                'total_mentions': data.get('total_mentions', 0),
-                'backtesting_accuracy': data.get('backtesting_accuracy', 0)
-            }
-            
-            # Add top stock data
-            rankings = data.get('top_rankings', [])
-            for i, stock in enumerate(rankings[:5], 1):
-                base_metrics[f'top_{i}_symbol'] = stock.get('symbol', '')
-                base_metrics[f'top_{i}_score'] = stock.get('score', 0)
-                base_metrics[f'top_{i}_sentiment'] = stock.get('sentiment', 0)
-                base_metrics[f'top_{i}_mentions'] = stock.get('mentions', 0)
-            
-            all_data.append(base_metrics)
-            
-        except Exception as e:
-            print(f"Error loading {file}: {e}")
-            continue
+    # Extract key metrics
+    df = pd.DataFrame(all_data).reindex(columns=METRIC_COLUMNS)
+    df[METRIC_COLUMNS[2:]] = df[METRIC_COLUMNS[2:]].fillna(0)
+    df[COUNT_COLUMNS] = df[COUNT_COLUMNS].astype(int)
     
-    if not all_data:
-        return None
+    # Add top stock data as top_<rank>_<field> columns
+    rankings = _build_rankings_frame(all_data)
+    if not rankings.empty:
+        top = rankings.pivot(index='day', columns='rank', values=RANKING_FIELDS)
+        top.columns = [f'top_{rank}_{field}' for field, rank in top.columns]
+        df = df.join(top)
     
-    df = pd.DataFrame(all_data)
     df['date'] = pd.to_datetime(df['date'], format='%Y%m%d')
     return df.sort_values('date')
 
+def load_daily_rankings():
+    """Load the top 5 rankings of all daily results as one row per (day, stock)"""
+    all_data = _load_daily_payloads()
+    if not all_data:
+        return None
+    
+    rankings = _build_rankings_frame(all_data)
+    return rankings.sort_values(['date', 'rank'], kind='stable')
+
+def _aggregate_appearances(rankings):
+    """Count appearances, average score and latest date per symbol on int-encoded arrays"""
+    codes, symbols = pd.factorize(rankings['symbol'])
+    appearances = np.bincount(codes, minlength=len(symbols))
+    score_sums = np.bincount(codes, weights=rankings['score'].to_numpy(dtype=np.float64),
+                             minlength=len(symbols))
+    latest = np.full(len(symbols), np.iinfo(np.int64).min)
+    np.maximum.at(latest, codes, rankings['date'].to_numpy(dtype='datetime64[ns]').view(np.int64))
+    
+    return pd.DataFrame({
+        'appearances': appearances,
+        'avg_score': score_sums / np.maximum(appearances, 1),
+        'latest': pd.to_datetime(latest)
+    }, index=pd.Index(symbols, name='symbol'))
+
 def analyze_stock_trends():
     """Analyze which stocks appear most frequently in top rankings"""
-    df = load_daily_results()
-    if df is None:
+    rankings = load_daily_rankings()
+    if rankings is None:
         print("No daily results found")
         return
     
@@ -73,35 +127,16 @@ def analyze_stock_trends():
     print("="*60)
     
     # Count appearances in top 5
-    stock_appearances = {}
-    stock_scores = {}
-    
-    for _, row in df.iterrows():
-        date = row['date'].strftime('%Y-%m-%d')
-        for i in range(1, 6):
-            symbol = row.get(f'top_{i}_symbol', '')
-            score = row.get(f'top_{i}_score', 0)
-            
-            if symbol and symbol.strip():
-                if symbol not in stock_appearances:
-                    stock_appearances[symbol] = []
-                    stock_scores[symbol] = []
-                
-                stock_appearances[symbol].append(date)
-                stock_scores[symbol].append(score)
-    
-    # Sort by frequency
-    frequent_stocks = sorted(stock_appearances.items(), 
-                           key=lambda x: len(x[1]), reverse=True)
+    rankings = rankings[rankings['symbol'].str.strip() != '']
+    frequent_stocks = _aggregate_appearances(rankings).sort_values(
+        'appearances', ascending=False, kind='stable')
     
     print(f"\n🏆 Most Frequently Ranked Stocks:")
     print("-" * 60)
-    for symbol, dates in frequent_stocks[:10]:
-        appearances = len(dates)
-        avg_score = sum(stock_scores[symbol]) / len(stock_scores[symbol])
-        print(f"{symbol:>6} | Appearances: {appearances:>2} | "
-              f"Avg Score: {avg_score:.3f} | "
-              f"Latest: {dates[-1]}")
+    for symbol, stats in frequent_stocks.head(10).iterrows():
+        print(f"{symbol:>6} | Appearances: {stats['appearances']:>2} | "
+              f"Avg Score: {stats['avg_score']:.3f} | "
+              f"Latest: {stats['latest'].strftime('%Y-%m-%d')}")
     
     return frequent_stocks
 
@@ -152,18 +187,11 @@ def create_historical_report():
         # Recent performance
         print(f"\n🔍 RECENT PERFORMANCE (Last 7 Days):")
         print("-" * 60)
-        recent_df = df.tail(7)
-        
-        for _, row in recent_df.iterrows():
-            date = row['date'].strftime('%Y-%m-%d')
-            posts = row['total_posts']
-            stocks = row['total_stocks']
-            confidence = row['average_confidence']
-            top_stock = row.get('top_1_symbol', 'N/A')
-            top_score = row.get('top_1_score', 0)
-            
-            print(f"{date} | Posts: {posts:>3} | Stocks: {stocks:>2} | "
-                  f"Confidence: {confidence:.3f} | Top: {top_stock} ({top_score:.3f})")
+        recent_df = df.tail(7).reindex(columns=['date', 'total_posts', 'total_stocks',
+                                                'average_confidence', 'top_1_symbol', 'top_1_score'])
+        recent_df['date'] = recent_df['date'].dt.strftime('%Y-%m-%d')
+        recent_df.columns = ['Date', 'Posts', 'Stocks', 'Confidence', 'Top', 'Top Score']
+        print(recent_df.to_string(index=False, na_rep='N/A', float_format='{:.3f}'.format))
     
     print(f"\n✅ Historical analysis complete!")
     print("="*80)
@@ -3,6 +3,7 @@ Run backtesting analysis to validate sentiment predictions against actual stock
 """
 
 import asyncio
+import importlib.util
 import sys
 from pathlib import Path
 
@@ -18,10 +19,9 @@ def main():
     print("This will analyze how well our sentiment predictions correlate with actual price movements.\n")
     
     # Check if we need to install yfinance
-    try:
-        import yfinance
+    if importlib.util.find_spec("yfinance") is not None:
         print("✅ yfinance available for price data")
-    except ImportError:
+    else:
         print("❌ yfinance not found. Installing...")
         import subprocess
         subprocess.check_call([sys.executable, "-m", "pip", "install", "yfinance"])
@@ -8,6 +8,8 @@ import sys
 import argparse
 from pathlib import Path
 
+import numpy as np
+
 # Add src to Python path
 sys.path.append(str(Path(__file__).parent / 'src'))
 
@@ -52,8 +54,10 @@ async def run_comprehensive_analysis(mode="comprehensive"):
         print(f"\n📊 ANALYSIS SUMMARY:")
         print(f"   • Total stocks analyzed: {len(rankings)}")
         if rankings:
+            confidence = np.fromiter((s['confidence_score'] for s in rankings), dtype=np.float64, count=len(rankings))
+            sentiment = np.fromiter((s['composite_sentiment'] for s in rankings), dtype=np.float64, count=len(rankings))
             total_mentions = sum(stock['total_mentions'] for stock in rankings)
-            avg_confidence = sum(stock['confidence_score'] for stock in rankings) / len(rankings)
+            avg_confidence = confidence.mean()
             print(f"   • Total stock mentions: {total_mentions}")
             print(f"   • Average confidence: {avg_confidence:.3f}")
         
@@ -62,36 +66,34 @@ async def run_comprehensive_analysis(mode="comprehensive"):
         print(f"{'Rank':<4} {'Symbol':<8} {'Score':<8} {'Sentiment':<10} {'Mentions':<8} {'Confidence':<10} {'Engagement':<12}")
         print("-" * 80)
         
-        for stock in rankings[:15]:
-            reddit_engagement = stock.get('reddit_engagement', 0)
-            print(f"{stock['rank']:<4} {stock['symbol']:<8} "
-                  f"{stock['composite_score']:<8.3f} {stock['composite_sentiment']:<10.3f} "
-                  f"{stock['total_mentions']:<8} {stock['confidence_score']:<10.3f} "
-                  f"{reddit_engagement:<12.0f}")
+        sys.stdout.write(''.join(
+            f"{stock['rank']:<4} {stock['symbol']:<8} "
+            f"{stock['composite_score']:<8.3f} {stock['composite_sentiment']:<10.3f} "
+            f"{stock['total_mentions']:<8} {stock['confidence_score']:<10.3f} "
+            f"{stock.get('reddit_engagement', 0):<12.0f}\n"
+            for stock in rankings[:15]
+        ))
         
         # Show confidence breakdown
         if rankings:
-            high_confidence = [s for s in rankings if s['confidence_score'] >= 0.7]
-            medium_confidence = [s for s in rankings if 0.4 <= s['confidence_score'] < 0.7]
-            low_confidence = [s for s in rankings if s['confidence_score'] < 0.4]
+            low_confidence, medium_confidence, high_confidence = np.bincount(
+                np.digitize(confidence, [0.4, 0.7]), minlength=3)
             
             print(f"\n📈 CONFIDENCE BREAKDOWN:")
-            print(f"   🟢 High Confidence (≥0.7): {len(high_confidence)} stocks")
-            print(f"   🟡 Medium Confidence (0.4-0.7): {len(medium_confidence)} stocks") 
-            print(f"   🔴 Low Confidence (<0.4): {len(low_confidence)} stocks")
+            print(f"   🟢 High Confidence (≥0.7): {high_confidence} stocks")
+            print(f"   🟡 Medium Confidence (0.4-0.7): {medium_confidence} stocks") 
+            print(f"   🔴 Low Confidence (<0.4): {low_confidence} stocks")
         
         # Show sentiment distribution
         if rankings:
-            very_bullish = [s for s in rankings if s['composite_sentiment'] >= 0.5]
-            bullish = [s for s in rankings if 0.1 <= s['composite_sentiment'] < 0.5]
-            neutral = [s for s in rankings if -0.1 <= s['composite_sentiment'] < 0.1]
-            bearish = [s for s in rankings if s['composite_sentiment'] < -0.1]
+            bearish, neutral, bullish, very_bullish = np.bincount(
+                np.digitize(sentiment, [-0.1, 0.1, 0.5]), minlength=4)
             
             print(f"\n💹 SENTIMENT DISTRIBUTION:")
-            print(f"   🚀 Very Bullish (≥0.5): {len(very_bullish)} stocks")
-            print(f"   📈 Bullish (0.1-0.5): {len(bullish)} stocks")
-            print(f"   ➖ Neutral (-0.1-0.1): {len(neutral)} stocks")
-            print(f"   📉 Bearish (<-0.1): {len(bearish)} stocks")
+            print(f"   🚀 Very Bullish (≥0.5): {very_bullish} stocks")
+            print(f"   📈 Bullish (0.1-0.5): {bullish} stocks")
+            print(f"   ➖ Neutral (-0.1-0.1): {neutral} stocks")
+            print(f"   📉 Bearish (<-0.1): {bearish} stocks")
         
         print("\n" + "="*80)
         print("✅ Comprehensive analysis complete!")
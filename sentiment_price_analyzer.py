@@ -4,31 +4,72 @@ Comprehensive Sentiment vs Stock Price Performance Analyzer
 Amalgamates historical sentiment data with actual stock price movements
 """
 
-import json
 import pandas as pd
 import sqlite3
-import yfinance as yf
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta, date
 from collections import defaultdict
 import numpy as np
 
+from src.data.price_cache import PriceCache
+from src.utils.helpers import dump_json, load_json, scan_daily_results
+
+LOAD_WORKERS = 8
+REPORT_DTYPES = {
+    'symbol': 'category',
+    'sentiment_score': 'float32',
+    'mentions': 'int32',
+    'confidence': 'float32',
+    'price_change_1d': 'float32',
+    'price_change_3d': 'float32',
+    'price_change_7d': 'float32',
+    'current_price': 'float32'
+}
+PRICE_COLUMNS = ['symbol', 'trading_date', 'Close', 'price_change_1d', 'price_change_3d', 'price_change_7d']
+
+# Ranking fields of the daily JSON results and the sentiment columns they map to
+JSON_SENTIMENT_COLUMNS = {
+    'symbol': 'symbol',
+    'composite_sentiment': 'sentiment_score',
+    'total_mentions': 'mentions',
+    'confidence_score': 'confidence',
+    'composite_score': 'composite_score'
+}
+
 class SentimentPriceAnalyzer:
     """Analyzes correlation between sentiment and actual stock price movements"""
     
     def __init__(self, db_path="data/stock_sentiment.db", results_dir="daily_results"):
         self.db_path = db_path
         self.results_dir = Path(results_dir)
+        self.price_cache = PriceCache(db_path)
+        
+        # One connection reused across loads; they run on a worker thread
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.execute('PRAGMA cache_size=-65536')
+        self._conn.execute('PRAGMA mmap_size=268435456')
+        self._finalizer = weakref.finalize(self, self._conn.close)
+        
+    def close(self):
+        """Close the database connection"""
+        self._finalizer()
         
     def load_historical_sentiment(self, days_back=30):
         """Load historical sentiment data from daily results and database"""
         print(f"📊 Loading sentiment data from past {days_back} days...")
         
-        # Load from daily JSON results
-        json_data = self._load_json_sentiment_data(days_back)
-        
-        # Load from database for more granular data
-        db_data = self._load_database_sentiment_data(days_back)
+        # Load from daily JSON results and, for more granular data, from the database.
+        # The two sources are independent, so read them concurrently.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            json_future = executor.submit(self._load_json_sentiment_data, days_back)
+            db_future = executor.submit(self._load_database_sentiment_data, days_back)
+            json_data = json_future.result()
+            db_data = db_future.result()
         
         # Combine and deduplicate
         combined_data = self._combine_sentiment_data(json_data, db_data)
@@ -36,36 +77,44 @@ class SentimentPriceAnalyzer:
         print(f"✅ Loaded sentiment data for {len(combined_data)} unique stock-date combinations")
         return combined_data
     
+    def _load_json_file(self, path):
+        """Load one daily results file, returning None if it can't be read"""
+        try:
+            return load_json(path)
+        except Exception as e:
+            print(f"⚠️ Error loading {path}: {e}")
+            return None
+    
     def _load_json_sentiment_data(self, days_back):
         """Load sentiment data from daily JSON files"""
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-        sentiment_data = []
-        
-        for json_file in self.results_dir.glob("analysis_*.json"):
-            try:
-                file_date = datetime.strptime(json_file.stem.split('_')[1], "%Y%m%d")
-                if file_date < cutoff_date:
+        # YYYYMMDD stems sort like dates, so compare them as strings without parsing
+        cutoff_stem = (datetime.now() - timedelta(days=days_back)).strftime('%Y%m%d')
+        recent_files = []
+        
+        if self.results_dir.exists():
+            # Walk newest first and stop at the cutoff, so older files are never opened
+            for entry in reversed(scan_daily_results(self.results_dir)):
+                stem = entry.name[len('analysis_'):-len('.json')]
+                if len(stem) != 8 or not stem.isdigit():
                     continue
-                    
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
-                
-                date_str = file_date.strftime('%Y-%m-%d')
-                
-                for stock in data.get('top_rankings', []):
-                    sentiment_data.append({
-                        'date': date_str,
-                        'symbol': stock.get('symbol'),
-                        'sentiment_score': stock.get('composite_sentiment', 0),
-                        'mentions': stock.get('total_mentions', 0),
-                        'confidence': stock.get('confidence_score', 0),
-                        'composite_score': stock.get('composite_score', 0),
-                        'source': 'json'
-                    })
-                    
-            except Exception as e:
-                print(f"⚠️ Error loading {json_file}: {e}")
-                continue
+                if stem <= cutoff_stem:
+                    break
+                recent_files.append((f"{stem[:4]}-{stem[4:6]}-{stem[6:]}", entry.path))
+        
+        # Reads are I/O-bound, so overlap them across a small thread pool
+        with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
+            payloads = executor.map(self._load_json_file, [path for _, path in recent_files])
+            records = [{'file_date': date_str, 'top_rankings': data.get('top_rankings', [])}
+                       for (date_str, _), data in zip(recent_files, payloads) if data is not None]
+        
+        # Flatten every day's rankings into one frame in a single pass
+        rankings = pd.json_normalize(records, record_path='top_rankings', meta='file_date')
+        sentiment_data = rankings.reindex(columns=['file_date', *JSON_SENTIMENT_COLUMNS])
+        sentiment_data = sentiment_data.rename(columns={'file_date': 'date', **JSON_SENTIMENT_COLUMNS})
+        numeric_columns = ['sentiment_score', 'mentions', 'confidence', 'composite_score']
+        sentiment_data[numeric_columns] = sentiment_data[numeric_columns].fillna(0)
+        sentiment_data['mentions'] = sentiment_data['mentions'].astype(int)
+        sentiment_data['source'] = 'json'
         
         return sentiment_data
     
@@ -74,8 +123,7 @@ class SentimentPriceAnalyzer:
         cutoff_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            query = """
+            db_data = pd.read_sql_query("""
             SELECT 
                 DATE(created_at) as date,
                 symbol,
@@ -83,71 +131,66 @@ class SentimentPriceAnalyzer:
                 SUM(mentions) as mentions,
                 COUNT(*) as records
             FROM symbol_sentiment_history 
-            WHERE DATE(created_at) >= ?
+            WHERE created_at >= ?
             GROUP BY DATE(created_at), symbol
             ORDER BY date DESC, symbol
-            """
-            
-            db_data = []
-            for row in conn.execute(query, (cutoff_date,)):
-                db_data.append({
-                    'date': row[0],
-                    'symbol': row[1],
-                    'sentiment_score': row[2],
-                    'mentions': row[3],
-                    'confidence': min(row[4] / 10.0, 1.0),  # Rough confidence based on records
-                    'composite_score': row[2],  # Use sentiment as composite for DB data
-                    'source': 'database'
-                })
+            """, self._conn, params=(f"{cutoff_date} 00:00:00",))
             
-            conn.close()
+            db_data['confidence'] = (db_data.pop('records') / 10.0).clip(upper=1.0)  # Rough confidence based on records
+            db_data['composite_score'] = db_data['sentiment_score']  # Use sentiment as composite for DB data
+            db_data['source'] = 'database'
             return db_data
             
         except Exception as e:
             print(f"⚠️ Error loading database data: {e}")
-            return []
+            return pd.DataFrame()
     
     def _combine_sentiment_data(self, json_data, db_data):
         """Combine and deduplicate sentiment data from multiple sources"""
-        combined = {}
+        combined = pd.concat([
+            pd.DataFrame(db_data).assign(_priority=0),
+            pd.DataFrame(json_data).assign(_priority=1)
+        ], ignore_index=True)
         
-        # Prefer JSON data over database data (more complete)
-        for item in db_data + json_data:  # DB first, then JSON overwrites
-            key = f"{item['date']}_{item['symbol']}"
-            combined[key] = item
+        if combined.empty:
+            return pd.DataFrame(columns=['date', 'symbol', 'sentiment_score', 'mentions',
+                                         'confidence', 'composite_score', 'source'])
         
-        return list(combined.values())
+        # Prefer JSON data over database data (more complete)
+        combined = combined.sort_values('_priority', kind='stable')
+        combined = combined.drop_duplicates(['date', 'symbol'], keep='last')
+        return combined.drop(columns='_priority').reset_index(drop=True)
     
     def get_price_data(self, symbols, days_back=30):
-        """Fetch historical price data for symbols"""
+        """Fetch historical price data for symbols as one row per (symbol, trading day)"""
         print(f"📈 Fetching price data for {len(symbols)} symbols...")
         
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back + 10)  # Extra buffer for price calc
         
-        price_data = {}
+        closes = self.price_cache.get_close_prices(symbols, start_date, end_date)
         
         for symbol in symbols:
-            try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(start=start_date, end=end_date)
-                
-                if not hist.empty:
-                    # Calculate daily price changes
-                    hist['price_change_1d'] = hist['Close'].pct_change() * 100
-                    hist['price_change_3d'] = hist['Close'].pct_change(periods=3) * 100
-                    hist['price_change_7d'] = hist['Close'].pct_change(periods=7) * 100
-                    
-                    price_data[symbol] = hist
-                    print(f"  ✅ {symbol}: {len(hist)} days of data")
-                else:
-                    print(f"  ⚠️ {symbol}: No price data available")
-                    
-            except Exception as e:
-                print(f"  ❌ {symbol}: Error fetching data - {e}")
-                continue
-        
-        return price_data
+            if symbol not in closes.columns:
+                print(f"  ⚠️ {symbol}: No price data available")
+            else:
+                print(f"  ✅ {symbol}: {closes[symbol].count()} days of data")
+        
+        if closes.empty:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        
+        # Calculate price changes over each symbol's own trading days, not the union of every symbol's dates
+        frames = {}
+        for symbol in closes.columns:
+            close = closes[symbol].dropna()
+            columns = {'Close': close}
+            for period in (1, 3, 7):
+                columns[f'price_change_{period}d'] = close.pct_change(periods=period) * 100
+            frames[symbol] = pd.DataFrame(columns)
+        
+        # Concatenate into long columns, one row per (symbol, trading day) with a close
+        price_data = pd.concat(frames, names=['symbol', 'trading_date']).reset_index()
+        return price_data.sort_values(['trading_date', 'symbol'], ignore_index=True)[PRICE_COLUMNS]
     
     def analyze_sentiment_price_correlation(self, days_back=30):
         """Comprehensive analysis of sentiment vs price performance"""
@@ -156,12 +199,12 @@ class SentimentPriceAnalyzer:
         
         # Load sentiment data
         sentiment_data = self.load_historical_sentiment(days_back)
-        if not sentiment_data:
+        if sentiment_data.empty:
             print("❌ No sentiment data available")
             return None
         
         # Get unique symbols
-        symbols = list(set(item['symbol'] for item in sentiment_data))
+        symbols = sentiment_data['symbol'].dropna().unique().tolist()
         print(f"📊 Analyzing {len(symbols)} unique symbols")
         
         # Get price data
@@ -178,65 +221,46 @@ class SentimentPriceAnalyzer:
         correct_predictions = {'1d': 0, '3d': 0, '7d': 0}
         total_predictions = {'1d': 0, '3d': 0, '7d': 0}
         
-        for sentiment_item in sentiment_data:
-            symbol = sentiment_item['symbol']
-            sentiment_date = datetime.strptime(sentiment_item['date'], '%Y-%m-%d').date()
-            
-            if symbol not in price_data:
-                continue
-            
-            price_hist = price_data[symbol]
+        sentiment_df = pd.DataFrame(sentiment_data)
+        if not sentiment_df.empty:
+            sentiment_df = sentiment_df[sentiment_df['symbol'].isin(price_data['symbol'].unique())]
+        
+        if not sentiment_df.empty:
+            sentiment_df = sentiment_df.reset_index()
+            # merge_asof keys must share a dtype; either sentiment source may come back empty as object
+            sentiment_df['symbol'] = sentiment_df['symbol'].astype(price_data['symbol'].dtype)
+            sentiment_df['trading_date'] = pd.to_datetime(sentiment_df['date']).astype(
+                price_data['trading_date'].dtype)
             
-            # Find the closest trading day
-            trading_dates = [d.date() for d in price_hist.index]
-            closest_date = min(trading_dates, key=lambda x: abs((x - sentiment_date).days))
+            # Match each sentiment row to the closest trading day, skipping if too far apart
+            merged = pd.merge_asof(
+                sentiment_df.sort_values('trading_date'),
+                price_data.sort_values('trading_date'),
+                on='trading_date',
+                by='symbol',
+                direction='nearest',
+                tolerance=pd.Timedelta(days=3)
+            )
+            merged = merged.dropna(subset=['Close']).sort_values('index')
             
-            if abs((closest_date - sentiment_date).days) > 3:  # Skip if too far apart
-                continue
+            # Determine if predictions were correct for each time horizon
+            sentiment_bullish = merged['sentiment_score'] > 0.1
+            sentiment_bearish = merged['sentiment_score'] < -0.1
+            prediction_made = sentiment_bullish | sentiment_bearish
             
-            try:
-                price_row = price_hist.loc[price_hist.index.date == closest_date].iloc[0]
-                
-                sentiment_score = sentiment_item['sentiment_score']
-                mentions = sentiment_item['mentions']
-                confidence = sentiment_item['confidence']
-                
-                # Analyze different time horizons
-                for period in ['1d', '3d', '7d']:
-                    price_change = price_row[f'price_change_{period}']
-                    
-                    if pd.isna(price_change):
-                        continue
-                    
-                    # Determine if prediction was correct
-                    sentiment_bullish = sentiment_score > 0.1
-                    sentiment_bearish = sentiment_score < -0.1
-                    price_up = price_change > 0
-                    
-                    prediction_made = sentiment_bullish or sentiment_bearish
-                    
-                    if prediction_made:
-                        total_predictions[period] += 1
-                        
-                        # Check if prediction was correct
-                        if (sentiment_bullish and price_up) or (sentiment_bearish and not price_up):
-                            correct_predictions[period] += 1
-                
-                # Store result
-                results.append({
-                    'symbol': symbol,
-                    'date': sentiment_item['date'],
-                    'sentiment_score': sentiment_score,
-                    'mentions': mentions,
-                    'confidence': confidence,
-                    'price_change_1d': price_row.get('price_change_1d', 0),
-                    'price_change_3d': price_row.get('price_change_3d', 0),
-                    'price_change_7d': price_row.get('price_change_7d', 0),
-                    'current_price': price_row['Close']
-                })
+            for period in ['1d', '3d', '7d']:
+                price_change = merged[f'price_change_{period}']
+                valid = prediction_made & price_change.notna()
+                price_up = price_change > 0
+                correct = valid & ((sentiment_bullish & price_up) | (sentiment_bearish & ~price_up))
                 
-            except Exception as e:
-                continue
+                total_predictions[period] = int(valid.sum())
+                correct_predictions[period] = int(correct.sum())
+            
+            results = merged[[
+                'symbol', 'date', 'sentiment_score', 'mentions', 'confidence',
+                'price_change_1d', 'price_change_3d', 'price_change_7d', 'Close'
+            ]].rename(columns={'Close': 'current_price'}).to_dict('records')
         
         # Calculate accuracy metrics
         accuracies = {}
@@ -283,55 +307,39 @@ class SentimentPriceAnalyzer:
         df = pd.DataFrame(results)
         
         if not df.empty:
+            # Single precision is plenty for scores and percent changes and halves the memory
+            df['mentions'] = df['mentions'].fillna(0)
+            df = df.astype(REPORT_DTYPES)
+            
             print(f"\n🏆 TOP PERFORMING STOCKS (Sentiment → Price Correlation):")
             print("-" * 60)
             
             # Group by symbol and calculate performance metrics
-            symbol_performance = []
+            symbol_performance = df.groupby('symbol', sort=False, observed=True).agg(
+                avg_sentiment=('sentiment_score', 'mean'),
+                avg_price_change_7d=('price_change_7d', 'mean'),
+                total_mentions=('mentions', 'sum'),
+                avg_confidence=('confidence', 'mean'),
+                data_points=('sentiment_score', 'size')
+            )
             
-            for symbol in df['symbol'].unique():
-                symbol_data = df[df['symbol'] == symbol]
-                
-                # Calculate correlation metrics
-                pos_sentiment_count = len(symbol_data[symbol_data['sentiment_score'] > 0.1])
-                neg_sentiment_count = len(symbol_data[symbol_data['sentiment_score'] < -0.1])
-                
-                avg_sentiment = symbol_data['sentiment_score'].mean()
-                avg_price_change_7d = symbol_data['price_change_7d'].mean()
-                total_mentions = symbol_data['mentions'].sum()
-                avg_confidence = symbol_data['confidence'].mean()
-                
-                # Simple correlation check
-                correlation_score = 0
-                if avg_sentiment > 0.1 and avg_price_change_7d > 0:
-                    correlation_score = min(avg_sentiment * avg_price_change_7d, 1.0)
-                elif avg_sentiment < -0.1 and avg_price_change_7d < 0:
-                    correlation_score = min(abs(avg_sentiment * avg_price_change_7d), 1.0)
-                
-                symbol_performance.append({
-                    'symbol': symbol,
-                    'avg_sentiment': avg_sentiment,
-                    'avg_price_change_7d': avg_price_change_7d,
-                    'total_mentions': total_mentions,
-                    'avg_confidence': avg_confidence,
-                    'correlation_score': correlation_score,
-                    'data_points': len(symbol_data)
-                })
+            # Simple correlation check: sentiment and 7d price change agree in direction.
+            # Both agreeing branches have a positive product, so one capped product serves both.
+            avg_sentiment = symbol_performance['avg_sentiment'].to_numpy()
+            avg_price_change_7d = symbol_performance['avg_price_change_7d'].to_numpy()
+            agrees = (((avg_sentiment > 0.1) & (avg_price_change_7d > 0)) |
+                      ((avg_sentiment < -0.1) & (avg_price_change_7d < 0)))
+            symbol_performance['correlation_score'] = np.where(
+                agrees, np.minimum(avg_sentiment * avg_price_change_7d, 1.0), 0)
             
             # Sort by correlation score
-            symbol_performance.sort(key=lambda x: x['correlation_score'], reverse=True)
+            symbol_performance = symbol_performance.sort_values(
+                'correlation_score', ascending=False, kind='stable')
             
-            for i, perf in enumerate(symbol_performance[:10], 1):
-                symbol = perf['symbol']
-                sentiment = perf['avg_sentiment']
-                price_change = perf['avg_price_change_7d']
-                mentions = perf['total_mentions']
-                confidence = perf['avg_confidence']
-                correlation = perf['correlation_score']
-                
-                print(f"{i:2d}. {symbol:>6} | Sentiment: {sentiment:>6.3f} | "
-                      f"7d Price Δ: {price_change:>6.2f}% | "
-                      f"Mentions: {mentions:>3} | Confidence: {confidence:.3f}")
+            for i, perf in enumerate(symbol_performance.head(10).itertuples(), 1):
+                print(f"{i:2d}. {perf.Index:>6} | Sentiment: {perf.avg_sentiment:>6.3f} | "
+                      f"7d Price Δ: {perf.avg_price_change_7d:>6.2f}% | "
+                      f"Mentions: {perf.total_mentions:>3} | Confidence: {perf.avg_confidence:.3f}")
         
         # Save detailed results
         self._save_analysis_results(analysis, days_back)
@@ -345,16 +353,6 @@ class SentimentPriceAnalyzer:
         """Save analysis results to JSON file"""
         results_file = f"sentiment_price_analysis_{datetime.now().strftime('%Y%m%d')}.json"
         
-        # Convert datetime objects to strings for JSON serialization
-        serializable_results = []
-        for result in analysis['results']:
-            serializable_result = result.copy()
-            # Convert any numpy types to regular Python types
-            for key, value in serializable_result.items():
-                if isinstance(value, (np.integer, np.floating)):
-                    serializable_result[key] = float(value)
-            serializable_results.append(serializable_result)
-        
         output_data = {
             'generated_date': datetime.now().isoformat(),
             'analysis_period_days': days_back,
@@ -362,11 +360,10 @@ class SentimentPriceAnalyzer:
             'accuracies': analysis['accuracies'],
             'total_predictions': analysis['total_predictions'],
             'correct_predictions': analysis['correct_predictions'],
-            'detailed_results': serializable_results
+            'detailed_results': analysis['results']  # numpy scalars are serialized natively
         }
         
-        with open(results_file, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        dump_json(output_data, results_file)
         
         print(f"💾 Detailed results saved to: {results_file}")
 
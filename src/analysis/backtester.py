@@ -6,28 +6,68 @@ import logging
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 import sqlite3
+import weakref
 
-try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
-except ImportError:
-    YFINANCE_AVAILABLE = False
-    logging.warning("yfinance not available. Install with: pip install yfinance")
-
-from ..utils.config import Config
+from ..data.price_cache import PriceCache
+from ..utils.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Symbols repeat across days, so hold them as categories; scores stay float64 because they are reported as is
+SENTIMENT_DTYPES = {
+    'symbol': 'category'
+}
+FORWARD_RETURN_DAYS = [1, 3, 7]
+FORWARD_RETURN_COLUMNS = ['Forward_1d_Return', 'Forward_3d_Return', 'Forward_7d_Return']
+DETAILED_RESULT_DTYPE = np.dtype([
+    ('symbol', 'O'),
+    ('date', 'M8[ns]'),
+    ('sentiment_score', 'f8'),
+    ('confidence_score', 'f8'),
+    ('forward_1d_return', 'f8'),
+    ('forward_3d_return', 'f8'),
+    ('forward_7d_return', 'f8'),
+    ('predicted_direction', 'i1')
+])
+DETAILED_RESULT_SOURCES = {
+    'symbol': 'symbol',
+    'date': 'date',
+    'composite_sentiment': 'sentiment_score',
+    'confidence_score': 'confidence_score',
+    'Forward_1d_Return': 'forward_1d_return',
+    'Forward_3d_Return': 'forward_3d_return',
+    'Forward_7d_Return': 'forward_7d_return'
+}
+READ_CHUNK_SIZE = 10000
+
+# Right-closed confidence bins; scores outside (0, 1] get no label
+CONFIDENCE_BIN_EDGES = np.array([0, 0.3, 0.5, 0.7, 1.0])
+CONFIDENCE_BIN_LABELS = np.array([None, 'Low', 'Medium-Low', 'Medium-High', 'High', None], dtype=object)
+
 
 class SentimentBacktester:
     """Backtesting engine to validate sentiment analysis against historical price movements."""
     
     def __init__(self, db_path="data/stock_sentiment.db"):
-        self.config = Config()
+        self.config = get_config()
         self.db_path = db_path
-        
+        self.price_cache = PriceCache(db_path)
+        
+        # One read connection reused across calls keeps SQLite's page cache warm
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.execute('PRAGMA cache_size=-64000')
+        self._conn.execute('PRAGMA mmap_size=268435456')
+        self._finalizer = weakref.finalize(self, self._conn.close)
+        
+    def close(self):
+        """Close the database connection."""
+        self._finalizer()
+    
     def get_historical_sentiment_data(self, days_back=30) -> pd.DataFrame:
         """
         Get historical sentiment rankings from database.
@@ -39,8 +79,6 @@ class SentimentBacktester:
             DataFrame with historical sentiment data
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            
             # Get historical rankings
             query = """
             SELECT 
@@ -54,17 +92,16 @@ class SentimentBacktester:
                 created_at,
                 DATE(created_at) as date
             FROM stock_rankings 
-            WHERE created_at >= datetime('now', '-{} days')
+            WHERE created_at >= datetime('now', ? || ' days')
             ORDER BY created_at DESC, composite_score DESC
-            """.format(days_back)
+            """
             
-            df = pd.read_sql_query(query, conn)
-            conn.close()
+            # Read in chunks to bound peak memory on long history windows
+            chunks = pd.read_sql_query(query, self._conn, params=(f'-{days_back}',),
+                                       chunksize=READ_CHUNK_SIZE,
+                                       parse_dates=['created_at', 'date'])
+            df = pd.concat(chunks, ignore_index=True).astype(SENTIMENT_DTYPES)
             
-            if not df.empty:
-                df['created_at'] = pd.to_datetime(df['created_at'])
-                df['date'] = pd.to_datetime(df['date'])
-                
             logger.info(f"Retrieved {len(df)} historical sentiment records")
             return df
             
@@ -76,6 +113,9 @@ class SentimentBacktester:
         """
         Get historical stock price data for given symbols.
         
+        Prices come from the local price cache, which only downloads the uncached
+        tail of each symbol's history, so cached prices are served without yfinance.
+        
         Args:
             symbols: List of stock symbols
             days_back: Number of days to look back
@@ -83,192 +123,194 @@ class SentimentBacktester:
         Returns:
             Dictionary mapping symbols to price DataFrames
         """
-        if not YFINANCE_AVAILABLE:
-            logger.error("yfinance not available for price data")
-            return {}
-        
         price_data = {}
         start_date = datetime.now() - timedelta(days=days_back + 5)  # Extra buffer
         end_date = datetime.now()
         
+        closes = self.price_cache.get_close_prices(symbols, start_date, end_date)
+        
         for symbol in symbols:
-            try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(start=start_date, end=end_date)
-                
-                if not hist.empty:
-                    # Calculate daily returns
-                    hist['Daily_Return'] = hist['Close'].pct_change()
-                    hist['Forward_1d_Return'] = hist['Daily_Return'].shift(-1)  # Next day return
-                    hist['Forward_3d_Return'] = hist['Close'].pct_change(periods=-3)  # 3-day forward return
-                    hist['Forward_7d_Return'] = hist['Close'].pct_change(periods=-7)  # 7-day forward return
-                    
-                    price_data[symbol] = hist
-                    logger.info(f"Retrieved price data for {symbol}: {len(hist)} days")
-                else:
-                    logger.warning(f"No price data found for {symbol}")
-                    
-            except Exception as e:
-                logger.error(f"Error getting price data for {symbol}: {e}")
+            if symbol not in closes.columns:
+                logger.warning(f"No price data found for {symbol}")
+                continue
+            
+            # Shift along the symbol's own trading days, not the union of every symbol's dates
+            close = closes[symbol].dropna()
+            hist = pd.DataFrame({'Close': close, 'Daily_Return': close.pct_change()})
+            for days, column in zip(FORWARD_RETURN_DAYS, FORWARD_RETURN_COLUMNS):
+                hist[column] = close.shift(-days) / close - 1  # Return from close to close `days` ahead
+            
+            price_data[symbol] = hist
+            logger.info(f"Retrieved price data for {symbol}: {len(hist)} days")
         
         return price_data
     
-    def calculate_sentiment_accuracy(self, sentiment_df: pd.DataFrame, price_data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    def match_predictions(self, sentiment_df: pd.DataFrame, price_data: Dict[str, pd.DataFrame]) -> np.ndarray:
+        """
+        Match sentiment records with the forward returns that followed them.
+        
+        Args:
+            sentiment_df: Historical sentiment data
+            price_data: Historical price data
+            
+        Returns:
+            Record array of predictions (DETAILED_RESULT_DTYPE) with at least one forward return
+        """
+        sentiment_df = sentiment_df[sentiment_df['symbol'].isin(list(price_data))]
+        if sentiment_df.empty:
+            return np.empty(0, dtype=DETAILED_RESULT_DTYPE)
+        
+        prices = pd.concat(price_data, names=['symbol', 'trade_date'])[FORWARD_RETURN_COLUMNS].reset_index()
+        sentiment = sentiment_df[['symbol', 'date', 'composite_sentiment', 'confidence_score']].reset_index(drop=True)
+        prices['symbol'] = prices['symbol'].astype(sentiment['symbol'].dtype)  # merge keys must share a dtype
+        sentiment['trade_date'] = sentiment['date'].dt.normalize().astype(prices['trade_date'].dtype)
+        
+        # Attach the first trading day on or after each sentiment date (allowing for weekends/holidays)
+        merged = pd.merge_asof(
+            sentiment.reset_index().sort_values('trade_date'),
+            prices.sort_values('trade_date'),
+            on='trade_date',
+            by='symbol',
+            direction='forward'
+        ).sort_values('index')
+        
+        # Skip predictions with no forward return at any horizon
+        merged = merged[merged[FORWARD_RETURN_COLUMNS].notna().any(axis=1)]
+        
+        # Fill the predictions column by column in a pre-allocated record array,
+        # predicting direction based on sentiment
+        predictions = np.empty(len(merged), dtype=DETAILED_RESULT_DTYPE)
+        for source, field in DETAILED_RESULT_SOURCES.items():
+            predictions[field] = merged[source].to_numpy()
+        predictions['predicted_direction'] = np.where(merged['composite_sentiment'].to_numpy() > 0, 1, -1)
+        
+        return predictions
+    
+    def calculate_sentiment_accuracy(self, sentiment_df: pd.DataFrame, price_data: Dict[str, pd.DataFrame],
+                                     include_details: bool = False) -> Dict[str, Any]:
         """
         Calculate how well sentiment predicts price movements.
         
         Args:
             sentiment_df: Historical sentiment data
             price_data: Historical price data
+            include_details: Whether to return the per-prediction record array
+            
+        Returns:
+            Dictionary with accuracy metrics
+        """
+        predictions = self.match_predictions(sentiment_df, price_data)
+        results = self._accuracy_metrics(predictions)
+        results['detailed_results'] = predictions if include_details else None
+        return results
+    
+    def _accuracy_metrics(self, predictions: np.ndarray) -> Dict[str, Any]:
+        """
+        Calculate accuracy metrics from matched predictions.
+        
+        Args:
+            predictions: Record array from match_predictions
             
         Returns:
             Dictionary with accuracy metrics
         """
         results = {
-            'total_predictions': 0,
+            'total_predictions': len(predictions),
             'correct_predictions_1d': 0,
             'correct_predictions_3d': 0,
             'correct_predictions_7d': 0,
             'accuracy_1d': 0.0,
             'accuracy_3d': 0.0,
             'accuracy_7d': 0.0,
-            'correlations': {},
-            'detailed_results': []
+            'correlations': {}
         }
-        
-        for _, row in sentiment_df.iterrows():
-            symbol = row['symbol']
-            sentiment_date = row['date']
-            sentiment_score = row['composite_sentiment']
-            confidence = row['confidence_score']
-            
-            if symbol not in price_data:
-                continue
-                
-            # Find price data for the sentiment date
-            symbol_prices = price_data[symbol]
-            
-            # Match dates (allowing for weekends/holidays)
-            date_matches = symbol_prices.index.date >= sentiment_date.date()
-            if not date_matches.any():
-                continue
-                
-            # Get the first trading day on or after sentiment date
-            price_row_idx = symbol_prices.index[date_matches][0]
-            price_row = symbol_prices.loc[price_row_idx]
-            
-            # Get forward returns
-            forward_1d = price_row.get('Forward_1d_Return', np.nan)
-            forward_3d = price_row.get('Forward_3d_Return', np.nan)
-            forward_7d = price_row.get('Forward_7d_Return', np.nan)
-            
-            if pd.isna(forward_1d) and pd.isna(forward_3d) and pd.isna(forward_7d):
-                continue
-            
-            results['total_predictions'] += 1
-            
-            # Predict direction based on sentiment
-            predicted_direction = 1 if sentiment_score > 0 else -1
-            
-            # Check accuracy for different time horizons
-            if not pd.isna(forward_1d):
-                actual_direction_1d = 1 if forward_1d > 0 else -1
-                if predicted_direction == actual_direction_1d:
-                    results['correct_predictions_1d'] += 1
-            
-            if not pd.isna(forward_3d):
-                actual_direction_3d = 1 if forward_3d > 0 else -1
-                if predicted_direction == actual_direction_3d:
-                    results['correct_predictions_3d'] += 1
-            
-            if not pd.isna(forward_7d):
-                actual_direction_7d = 1 if forward_7d > 0 else -1
-                if predicted_direction == actual_direction_7d:
-                    results['correct_predictions_7d'] += 1
-            
-            # Store detailed result
-            results['detailed_results'].append({
-                'symbol': symbol,
-                'date': sentiment_date,
-                'sentiment_score': sentiment_score,
-                'confidence_score': confidence,
-                'forward_1d_return': forward_1d,
-                'forward_3d_return': forward_3d,
-                'forward_7d_return': forward_7d,
-                'predicted_direction': predicted_direction
-            })
+        if len(predictions) == 0:
+            return results
+        
+        # Check predicted direction against each time horizon;
+        # a prediction is correct when the predicted and actual "up" bits agree
+        predicted_up = predictions['predicted_direction'] == 1
+        for period in ['1d', '3d', '7d']:
+            forward_return = predictions[f'forward_{period}_return']
+            correct = ~(predicted_up ^ (forward_return > 0)) & ~np.isnan(forward_return)
+            results[f'correct_predictions_{period}'] = int(np.count_nonzero(correct))
+        
+        # Pearson correlation of sentiment with each forward return, over rows where both are present
+        return_fields = [f'forward_{period}_return' for period in ['1d', '3d', '7d']]
+        returns = pd.DataFrame({field: predictions[field] for field in return_fields})
+        correlations = returns.corrwith(pd.Series(predictions['sentiment_score']))
+        results['correlations'] = {field: float(correlation) for field, correlation in correlations.items()}
         
         # Calculate accuracy rates
-        if results['total_predictions'] > 0:
-            results['accuracy_1d'] = results['correct_predictions_1d'] / results['total_predictions']
-            results['accuracy_3d'] = results['correct_predictions_3d'] / results['total_predictions']
-            results['accuracy_7d'] = results['correct_predictions_7d'] / results['total_predictions']
+        results['accuracy_1d'] = results['correct_predictions_1d'] / results['total_predictions']
+        results['accuracy_3d'] = results['correct_predictions_3d'] / results['total_predictions']
+        results['accuracy_7d'] = results['correct_predictions_7d'] / results['total_predictions']
         
         return results
     
-    def analyze_confidence_correlation(self, results: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_confidence_correlation(self, predictions: np.ndarray) -> Dict[str, Any]:
         """
         Analyze how confidence scores correlate with prediction accuracy.
         
         Args:
-            results: Results from calculate_sentiment_accuracy
+            predictions: Record array from match_predictions
             
         Returns:
             Confidence analysis results
         """
-        detailed_results = results['detailed_results']
-        if not detailed_results:
+        if len(predictions) == 0:
             return {}
         
-        df = pd.DataFrame(detailed_results)
-        
-        # Bin confidence scores
-        df['confidence_bin'] = pd.cut(df['confidence_score'], 
-                                    bins=[0, 0.3, 0.5, 0.7, 1.0], 
-                                    labels=['Low', 'Medium-Low', 'Medium-High', 'High'])
+        # Bin confidence scores, dropping scores outside every bin
+        confidence = predictions['confidence_score']
+        bins = np.searchsorted(CONFIDENCE_BIN_EDGES, confidence)
+        binned = (bins > 0) & (bins < len(CONFIDENCE_BIN_LABELS) - 1)
+        bins, confidence, predictions = bins[binned], confidence[binned], predictions[binned]
+        if len(bins) == 0:
+            return {}
         
-        confidence_analysis = {}
+        bin_counts = np.bincount(bins, minlength=len(CONFIDENCE_BIN_LABELS))
+        
+        def bin_means(values: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+            """Mean of the (masked) values in each bin, NaN for bins with none."""
+            if mask is None:
+                sums, counts = np.bincount(bins, weights=values, minlength=len(CONFIDENCE_BIN_LABELS)), bin_counts
+            else:
+                sums = np.bincount(bins[mask], weights=values[mask], minlength=len(CONFIDENCE_BIN_LABELS))
+                counts = np.bincount(bins[mask], minlength=len(CONFIDENCE_BIN_LABELS))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return sums / counts
+        
+        metrics = {
+            'count': bin_counts,
+            'avg_confidence': bin_means(confidence)
+        }
         
-        for conf_bin in df['confidence_bin'].unique():
-            if pd.isna(conf_bin):
-                continue
-                
-            bin_data = df[df['confidence_bin'] == conf_bin]
-            
-            # Calculate accuracy for this confidence bin
-            bin_results = {
-                'count': len(bin_data),
-                'avg_confidence': bin_data['confidence_score'].mean(),
-                'accuracy_1d': 0,
-                'accuracy_3d': 0, 
-                'accuracy_7d': 0,
-                'avg_return_1d': bin_data['forward_1d_return'].mean(),
-                'avg_return_3d': bin_data['forward_3d_return'].mean(),
-                'avg_return_7d': bin_data['forward_7d_return'].mean()
-            }
-            
-            # Calculate direction accuracy for each time horizon
-            for period in ['1d', '3d', '7d']:
-                return_col = f'forward_{period}_return'
-                if return_col in bin_data.columns:
-                    valid_data = bin_data.dropna(subset=[return_col])
-                    if len(valid_data) > 0:
-                        correct_predictions = sum(
-                            (valid_data['predicted_direction'] == 1) & (valid_data[return_col] > 0) |
-                            (valid_data['predicted_direction'] == -1) & (valid_data[return_col] < 0)
-                        )
-                        bin_results[f'accuracy_{period}'] = correct_predictions / len(valid_data)
-            
-            confidence_analysis[str(conf_bin)] = bin_results
+        # Direction hits per time horizon, counted only where there is a forward return
+        predicted_up = predictions['predicted_direction'] == 1
+        forward_returns = {period: predictions[f'forward_{period}_return'] for period in ['1d', '3d', '7d']}
+        for period, forward_return in forward_returns.items():
+            correct = np.where(predicted_up, forward_return > 0, forward_return < 0)
+            metrics[f'accuracy_{period}'] = np.nan_to_num(bin_means(correct, ~np.isnan(forward_return)))
+        for period, forward_return in forward_returns.items():
+            metrics[f'avg_return_{period}'] = bin_means(forward_return, ~np.isnan(forward_return))
+        
+        # Report bins in order of first appearance
+        present, first_seen = np.unique(bins, return_index=True)
+        confidence_analysis = {
+            CONFIDENCE_BIN_LABELS[conf_bin]: {name: values[conf_bin].item() for name, values in metrics.items()}
+            for conf_bin in present[np.argsort(first_seen)]
+        }
         
         return confidence_analysis
     
-    def run_comprehensive_backtest(self, days_back=30) -> Dict[str, Any]:
+    def run_comprehensive_backtest(self, days_back=30, include_details: bool = False) -> Dict[str, Any]:
         """
         Run comprehensive backtesting analysis.
         
         Args:
             days_back: Number of days to analyze
+            include_details: Whether to return the per-prediction record array
             
         Returns:
             Complete backtesting results
@@ -291,11 +333,14 @@ class SentimentBacktester:
             logger.warning("No price data retrieved")
             return {}
         
+        # Match predictions once and feed them to every analysis
+        predictions = self.match_predictions(sentiment_df, price_data)
+        
         # Calculate accuracy
-        accuracy_results = self.calculate_sentiment_accuracy(sentiment_df, price_data)
+        accuracy_results = self._accuracy_metrics(predictions)
         
         # Analyze confidence correlation
-        confidence_analysis = self.analyze_confidence_correlation(accuracy_results)
+        confidence_analysis = self.analyze_confidence_correlation(predictions)
         
         # Compile final results
         backtest_results = {
@@ -308,7 +353,8 @@ class SentimentBacktester:
                 'accuracy_7d': accuracy_results['accuracy_7d']
             },
             'confidence_analysis': confidence_analysis,
-            'detailed_results': accuracy_results['detailed_results'],
+            'correlations': accuracy_results['correlations'],
+            'detailed_results': predictions if include_details else None,
             'symbols_analyzed': symbols
         }
         
@@ -344,6 +390,15 @@ class SentimentBacktester:
         report.append(f"   • 3-Day Accuracy: {summary['accuracy_3d']:.1%}")
         report.append(f"   • 7-Day Accuracy: {summary['accuracy_7d']:.1%}")
         
+        correlations = results.get('correlations', {})
+        if correlations:
+            report.append(f"\n🔗 SENTIMENT / RETURN CORRELATION:")
+            for period in ['1d', '3d', '7d']:
+                # Undefined with fewer than two valid pairs or constant sentiment, common in short windows
+                correlation = correlations[f'forward_{period}_return']
+                value = 'N/A' if np.isnan(correlation) else f"{correlation:+.3f}"
+                report.append(f"   • {period.upper()} Forward Return: {value}")
+        
         if confidence_analysis:
             report.append(f"\n🎯 CONFIDENCE LEVEL ANALYSIS:")
             report.append("-" * 60)
@@ -2,9 +2,17 @@
 Sentiment analysis for stock-related social media posts.
 """
 
+import functools
 import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Union
-from collections import defaultdict
+
+import numpy as np
+import pandas as pd
 
 try:
     from textblob import TextBlob
@@ -27,17 +35,101 @@ except ImportError as e:
     TextBlob = None
     SentimentIntensityAnalyzer = None
 
-from ..utils.config import Config
+from ..utils.config import get_config
 from ..utils.helpers import extract_stock_symbols
 
 logger = logging.getLogger(__name__)
 
+# Keyword lexicon for the fallback analyzer; multi-word phrases are matched on the raw text
+POSITIVE_KEYWORDS = frozenset([
+    'buy', 'bull', 'bullish', 'moon', 'rocket', 'gain', 'profit', 'long',
+    'call', 'calls', 'up', 'rise', 'pump', 'hodl', 'hold'
+])
+POSITIVE_PHRASES = ('diamond hands',)
+
+NEGATIVE_KEYWORDS = frozenset([
+    'sell', 'bear', 'bearish', 'crash', 'loss', 'short', 'put', 'puts',
+    'down', 'fall', 'dump', 'rip', 'dead'
+])
+NEGATIVE_PHRASES = ('paper hands',)
+
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+# Scores averaged per symbol, in output order
+SCORE_FIELDS = ('positive', 'negative', 'compound')
+
+# VADER is pure Python, so large batches are scored across processes
+PARALLEL_MIN_TEXTS = 1000
+
+# Workers start from a clean server process rather than forking a parent that may be running threads
+POOL_CONTEXT = (multiprocessing.get_context('forkserver')
+                if 'forkserver' in multiprocessing.get_all_start_methods() else None)
+
+# Scoring pool shared by every SentimentAnalyzer in the process, started on first use
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+# VADER analyzer shared by every SentimentAnalyzer in the process, loaded on first use
+_VADER = None
+_VADER_LOCK = threading.Lock()
+
+# Feeds repeat texts (reposts, retweets), so VADER scores are cached by raw text
+VADER_CACHE_SIZE = 131072
+
+
+def _get_vader():
+    """Get the process-wide VADER analyzer, loading its lexicon once."""
+    global _VADER
+    if _VADER is None:
+        with _VADER_LOCK:
+            if _VADER is None:
+                _VADER = SentimentIntensityAnalyzer()
+    return _VADER
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Get the process-wide scoring pool; each worker loads the VADER lexicon once."""
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT,
+                                            initializer=_get_vader)
+    return _POOL
+
+
+def _discard_pool():
+    """Shut down the scoring pool so the next batch starts a fresh one."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+
+
+@functools.lru_cache(maxsize=VADER_CACHE_SIZE)
+def _vader_score(text: str) -> tuple:
+    """Score text with VADER as a (pos, neg, neu, compound) tuple."""
+    scores = _get_vader().polarity_scores(text)
+    return scores['pos'], scores['neg'], scores['neu'], scores['compound']
+
+
+def _score_with_vader(text: str) -> Dict[str, float]:
+    """Score text with VADER in the project's sentiment format."""
+    positive, negative, neutral, compound = _vader_score(text)
+    return {
+        'positive': positive,
+        'negative': negative,
+        'neutral': neutral,
+        'compound': compound
+    }
+
 
 class SentimentAnalyzer:
     """Sentiment analysis engine for social media posts."""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.sentiment_config = self.config.sentiment_config
         self.model_type = self.sentiment_config.get('model', 'vader')
         self.threshold = self.sentiment_config.get('threshold', 0.1)
@@ -48,7 +140,7 @@ class SentimentAnalyzer:
     def _initialize_vader(self):
         """Initialize VADER sentiment analyzer."""
         if SentimentIntensityAnalyzer:
-            return SentimentIntensityAnalyzer()
+            return _get_vader()
         else:
             logger.warning("VADER sentiment analyzer not available")
             return None
@@ -71,15 +163,31 @@ class SentimentAnalyzer:
             # Fallback to simple keyword-based analysis
             return self._analyze_with_keywords(text)
     
+    def analyze_texts(self, texts: List[str]) -> List[Dict[str, float]]:
+        """
+        Analyze sentiment of a batch of texts.
+        
+        Args:
+            texts: Texts to analyze
+            
+        Returns:
+            List of sentiment score dictionaries, in input order
+        """
+        workers = os.cpu_count() or 1
+        if (self.model_type == 'vader' and self.vader_analyzer
+                and len(texts) >= PARALLEL_MIN_TEXTS and workers > 1):
+            try:
+                return list(_get_pool(workers).map(_score_with_vader, texts,
+                                                   chunksize=max(1, len(texts) // (workers * 4))))
+            except Exception as e:
+                logger.warning(f"Parallel sentiment scoring failed, scoring serially: {e}")
+                _discard_pool()
+        
+        return [self.analyze_text(text) for text in texts]
+    
     def _analyze_with_vader(self, text: str) -> Dict[str, float]:
         """Analyze sentiment using VADER."""
-        scores = self.vader_analyzer.polarity_scores(text)
-        return {
-            'positive': scores['pos'],
-            'negative': scores['neg'],
-            'neutral': scores['neu'],
-            'compound': scores['compound']
-        }
+        return _score_with_vader(text)
     
     def _analyze_with_textblob(self, text: str) -> Dict[str, float]:
         """Analyze sentiment using TextBlob."""
@@ -106,19 +214,10 @@ class SentimentAnalyzer:
     
     def _analyze_with_keywords(self, text: str) -> Dict[str, float]:
         """Simple keyword-based sentiment analysis."""
-        positive_keywords = [
-            'buy', 'bull', 'bullish', 'moon', 'rocket', 'gain', 'profit', 'long',
-            'call', 'calls', 'up', 'rise', 'pump', 'diamond hands', 'hodl', 'hold'
-        ]
-        
-        negative_keywords = [
-            'sell', 'bear', 'bearish', 'crash', 'loss', 'short', 'put', 'puts',
-            'down', 'fall', 'dump', 'paper hands', 'rip', 'dead'
-        ]
-        
         text_lower = text.lower()
-        positive_count = sum(1 for word in positive_keywords if word in text_lower)
-        negative_count = sum(1 for word in negative_keywords if word in text_lower)
+        words = set(WORD_PATTERN.findall(text_lower))
+        positive_count = len(words & POSITIVE_KEYWORDS) + sum(phrase in text_lower for phrase in POSITIVE_PHRASES)
+        negative_count = len(words & NEGATIVE_KEYWORDS) + sum(phrase in text_lower for phrase in NEGATIVE_PHRASES)
         
         total = positive_count + negative_count
         if total == 0:
@@ -145,36 +244,30 @@ class SentimentAnalyzer:
         Returns:
             Dictionary with aggregated sentiment by stock symbol
         """
-        symbol_sentiments = defaultdict(list)
-        analyzed_posts = []
+        # Combine title and text for analysis and score every post up front
+        titles = [post.get('title') or '' for post in posts]
+        bodies = [post.get('text') or '' for post in posts]
+        texts = list(map(' '.join, zip(titles, bodies)))
+        sentiments = self.analyze_texts(texts)
         
-        for post in posts:
-            # Combine title and text for analysis
-            full_text = f"{post.get('title', '')} {post.get('text', '')}"
-            sentiment = self.analyze_text(full_text)
-            
-            # Add sentiment to post data
-            post_with_sentiment = post.copy()
-            post_with_sentiment['sentiment'] = sentiment
-            analyzed_posts.append(post_with_sentiment)
-            
-            # Aggregate by stock symbols
-            for symbol in post.get('symbols', []):
-                symbol_sentiments[symbol].append({
-                    'sentiment': sentiment,
-                    'score': post.get('score', 0),
-                    'upvote_ratio': post.get('upvote_ratio', 0.5),
-                    'num_comments': post.get('num_comments', 0)
-                })
+        # Add sentiment to post data
+        analyzed_posts = [{**post, 'sentiment': sentiment} for post, sentiment in zip(posts, sentiments)]
         
-        # Calculate aggregated sentiment scores
-        aggregated_sentiment = self._aggregate_sentiment_by_symbol(symbol_sentiments)
+        # Use engagement metrics as weights, gathered one numeric column at a time
+        scores = np.fromiter((post.get('score', 0) for post in posts), dtype=np.float64, count=len(posts))
+        upvote_ratios = np.fromiter((post.get('upvote_ratio', 0.5) for post in posts),
+                                    dtype=np.float64, count=len(posts))
+        weights = np.maximum(1, scores * upvote_ratios)
+        
+        # Calculate aggregated sentiment scores by stock symbol
+        aggregated_sentiment = self._aggregate_sentiment_by_symbol(
+            sentiments, [post.get('symbols', []) for post in posts], weights)
         
         return {
             'posts': analyzed_posts,
             'symbol_sentiment': aggregated_sentiment,
             'total_posts': len(posts),
-            'symbols_mentioned': list(symbol_sentiments.keys())
+            'symbols_mentioned': list(aggregated_sentiment)
         }
     
     def analyze_tweets(self, tweets: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -187,72 +280,65 @@ class SentimentAnalyzer:
         Returns:
             Dictionary with aggregated sentiment by stock symbol
         """
-        symbol_sentiments = defaultdict(list)
-        analyzed_tweets = []
+        sentiments = self.analyze_texts([tweet.get('text', '') for tweet in tweets])
         
-        for tweet in tweets:
-            sentiment = self.analyze_text(tweet.get('text', ''))
-            
-            # Add sentiment to tweet data
-            tweet_with_sentiment = tweet.copy()
-            tweet_with_sentiment['sentiment'] = sentiment
-            analyzed_tweets.append(tweet_with_sentiment)
-            
-            # Aggregate by stock symbols
-            for symbol in tweet.get('symbols', []):
-                symbol_sentiments[symbol].append({
-                    'sentiment': sentiment,
-                    'like_count': tweet.get('like_count', 0),
-                    'retweet_count': tweet.get('retweet_count', 0),
-                    'reply_count': tweet.get('reply_count', 0)
-                })
+        # Add sentiment to tweet data
+        analyzed_tweets = [{**tweet, 'sentiment': sentiment} for tweet, sentiment in zip(tweets, sentiments)]
         
-        # Calculate aggregated sentiment scores
-        aggregated_sentiment = self._aggregate_sentiment_by_symbol(symbol_sentiments)
+        # Use engagement metrics as weights, gathered one numeric column at a time
+        likes = np.fromiter((tweet.get('like_count', 0) for tweet in tweets), dtype=np.float64, count=len(tweets))
+        retweets = np.fromiter((tweet.get('retweet_count', 0) for tweet in tweets),
+                               dtype=np.float64, count=len(tweets))
+        weights = np.maximum(1, likes + retweets)
+        
+        # Calculate aggregated sentiment scores by stock symbol
+        aggregated_sentiment = self._aggregate_sentiment_by_symbol(
+            sentiments, [tweet.get('symbols', []) for tweet in tweets], weights)
         
         return {
             'tweets': analyzed_tweets,
             'symbol_sentiment': aggregated_sentiment,
             'total_tweets': len(tweets),
-            'symbols_mentioned': list(symbol_sentiments.keys())
+            'symbols_mentioned': list(aggregated_sentiment)
         }
     
-    def _aggregate_sentiment_by_symbol(self, symbol_sentiments: Dict[str, List[Dict]]) -> Dict[str, Dict]:
-        """Aggregate sentiment scores by stock symbol."""
-        aggregated = {}
+    def _aggregate_sentiment_by_symbol(self, sentiments: List[Dict[str, float]], symbols: List[List[str]],
+                                       weights: np.ndarray) -> Dict[str, Dict]:
+        """
+        Aggregate engagement-weighted sentiment scores by stock symbol.
         
-        for symbol, sentiments in symbol_sentiments.items():
-            if not sentiments:
-                continue
-            
-            # Calculate weighted averages
-            total_weight = 0
-            weighted_positive = 0
-            weighted_negative = 0
-            weighted_compound = 0
-            
-            for item in sentiments:
-                sentiment = item['sentiment']
-                
-                # Use engagement metrics as weights
-                weight = 1
-                if 'score' in item:  # Reddit post
-                    weight = max(1, item['score'] * item.get('upvote_ratio', 0.5))
-                elif 'like_count' in item:  # Tweet
-                    weight = max(1, item['like_count'] + item['retweet_count'])
-                
-                weighted_positive += sentiment['positive'] * weight
-                weighted_negative += sentiment['negative'] * weight
-                weighted_compound += sentiment['compound'] * weight
-                total_weight += weight
+        Args:
+            sentiments: Sentiment scores of each post or tweet
+            symbols: Stock symbols mentioned by each post or tweet
+            weights: Engagement weight of each post or tweet
             
-            if total_weight > 0:
-                aggregated[symbol] = {
-                    'positive': weighted_positive / total_weight,
-                    'negative': weighted_negative / total_weight,
-                    'compound': weighted_compound / total_weight,
-                    'mentions': len(sentiments),
-                    'total_weight': total_weight
-                }
+        Returns:
+            Dictionary mapping symbols to weighted average sentiment
+        """
+        # Flatten to one entry per (item, symbol) mention
+        counts = np.fromiter((len(item_symbols) for item_symbols in symbols), dtype=np.int64, count=len(symbols))
+        mentioned = [symbol for item_symbols in symbols for symbol in item_symbols]
+        if not mentioned:
+            return {}
+        
+        codes, unique_symbols = pd.factorize(np.asarray(mentioned, dtype=object))
+        item_ids = np.repeat(np.arange(len(symbols)), counts)
+        
+        # One contiguous array per score, weighted once per item then gathered per mention
+        total_weight = np.bincount(codes, weights=weights[item_ids])
+        mentions = np.bincount(codes)
+        weighted = {
+            field: np.bincount(codes, weights=(np.fromiter((sentiment[field] for sentiment in sentiments),
+                                                           dtype=np.float64, count=len(sentiments))
+                                               * weights)[item_ids]) / total_weight
+            for field in SCORE_FIELDS
+        }
         
-        return aggregated
+        return {
+            symbol: {
+                **{field: float(weighted[field][i]) for field in SCORE_FIELDS},
+                'mentions': int(mentions[i]),
+                'total_weight': float(total_weight[i])
+            }
+            for i, symbol in enumerate(unique_symbols)
+        }
@@ -5,18 +5,33 @@ Stock ranking system based on sentiment analysis.
 import logging
 from typing import List, Dict, Any, Tuple
 from datetime import datetime
-from collections import defaultdict
 
-from ..utils.config import Config
+import numpy as np
+
+from ..utils.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Decimal places of reported scores; arithmetic runs unrounded and rounds once at the end
+SCORE_DECIMALS = 4
+
+# Momentum sigmoid scale
+MOMENTUM_SCALE = 10
+
+# Minimum thresholds for high confidence
+MIN_REDDIT_MENTIONS = 3
+MIN_TWITTER_MENTIONS = 5
+MIN_TOTAL_MENTIONS = 8
+
+# Combined engagement treated as full-quality data
+EXPECTED_ENGAGEMENT = 100
+
 
 class StockRanker:
     """Stock ranking system based on sentiment analysis from multiple sources."""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.analysis_config = self.config.analysis_config
         self.min_mentions = self.analysis_config.get('min_mentions', 5)
         self.reddit_weight = self.analysis_config.get('weight_reddit', 0.6)
@@ -37,29 +52,8 @@ class StockRanker:
         reddit_symbols = reddit_sentiment.get('symbol_sentiment', {})
         twitter_symbols = twitter_sentiment.get('symbol_sentiment', {})
         
-        # Combine symbols from both sources
-        all_symbols = set(list(reddit_symbols.keys()) + list(twitter_symbols.keys()))
-        
-        ranked_stocks = []
-        
-        for symbol in all_symbols:
-            reddit_data = reddit_symbols.get(symbol, {})
-            twitter_data = twitter_symbols.get(symbol, {})
-            
-            # Calculate combined metrics
-            stock_metrics = self._calculate_stock_metrics(symbol, reddit_data, twitter_data)
-            
-            # Only include stocks with minimum mentions
-            total_mentions = stock_metrics['reddit_mentions'] + stock_metrics['twitter_mentions']
-            if total_mentions >= self.min_mentions:
-                ranked_stocks.append(stock_metrics)
-        
-        # Sort by composite score (descending)
-        ranked_stocks.sort(key=lambda x: x['composite_score'], reverse=True)
-        
-        # Add rankings
-        for i, stock in enumerate(ranked_stocks):
-            stock['rank'] = i + 1
+        # Calculate combined metrics for stocks with minimum mentions, ranked by composite score
+        ranked_stocks = self._calculate_metrics(reddit_symbols, twitter_symbols, self.min_mentions, ranked=True)
         
         logger.info(f"Ranked {len(ranked_stocks)} stocks")
         return ranked_stocks
@@ -76,31 +70,60 @@ class StockRanker:
         Returns:
             Dictionary with stock metrics and scores
         """
-        # Extract Reddit metrics
-        reddit_sentiment = reddit_data.get('compound', 0.0)
-        reddit_mentions = reddit_data.get('mentions', 0)
-        reddit_weight_total = reddit_data.get('total_weight', 0)
-        reddit_positive = reddit_data.get('positive', 0.0)
-        reddit_negative = reddit_data.get('negative', 0.0)
+        return self._calculate_metrics({symbol: reddit_data}, {symbol: twitter_data})[0]
+    
+    def _calculate_metrics(self, reddit_symbols: Dict[str, Dict], twitter_symbols: Dict[str, Dict],
+                           min_mentions: int = 0, ranked: bool = False) -> List[Dict[str, Any]]:
+        """
+        Calculate comprehensive metrics for many stock symbols at once.
         
-        # Extract Twitter metrics
-        twitter_sentiment = twitter_data.get('compound', 0.0)
-        twitter_mentions = twitter_data.get('mentions', 0)
-        twitter_weight_total = twitter_data.get('total_weight', 0)
-        twitter_positive = twitter_data.get('positive', 0.0)
-        twitter_negative = twitter_data.get('negative', 0.0)
+        Scores are computed on one array per metric, so every formula runs once
+        across all symbols instead of once per symbol.
+        
+        Args:
+            reddit_symbols: Reddit sentiment data by symbol
+            twitter_symbols: Twitter sentiment data by symbol
+            min_mentions: Minimum combined mentions for a symbol to be included
+            ranked: Whether to order by composite score (descending) and add each stock's rank
+            
+        Returns:
+            List of metric dictionaries, in first-seen symbol order unless ranked
+        """
+        # Index symbols from both sources once: Reddit symbols first, then Twitter-only ones
+        symbols = list(reddit_symbols)
+        symbols.extend(symbol for symbol in twitter_symbols if symbol not in reddit_symbols)
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+        reddit_positions = slice(0, len(reddit_symbols))
+        twitter_positions = np.fromiter((index[symbol] for symbol in twitter_symbols),
+                                        dtype=np.intp, count=len(twitter_symbols))
+        
+        def column(source: Dict[str, Dict], positions, key: str, rows=slice(None)) -> np.ndarray:
+            """Scatter one metric of a source into an array over all symbols, 0 where missing."""
+            values = np.zeros(len(symbols))
+            values[positions] = np.fromiter((data.get(key, 0) for data in source.values()),
+                                            dtype=np.float64, count=len(source))
+            return values[rows]
+        
+        # Drop symbols below the mention threshold before any scoring math
+        reddit_mentions = column(reddit_symbols, reddit_positions, 'mentions')
+        twitter_mentions = column(twitter_symbols, twitter_positions, 'mentions')
+        kept = np.flatnonzero((reddit_mentions + twitter_mentions) >= min_mentions)
+        reddit_mentions = reddit_mentions[kept]
+        twitter_mentions = twitter_mentions[kept]
+        
+        # Extract Reddit and Twitter metrics
+        reddit_sentiment = column(reddit_symbols, reddit_positions, 'compound', kept)
+        reddit_weight_total = column(reddit_symbols, reddit_positions, 'total_weight', kept)
+        twitter_sentiment = column(twitter_symbols, twitter_positions, 'compound', kept)
+        twitter_weight_total = column(twitter_symbols, twitter_positions, 'total_weight', kept)
         
         # Calculate weighted composite sentiment
         total_weight = (reddit_weight_total * self.reddit_weight + 
                        twitter_weight_total * self.twitter_weight)
-        
-        if total_weight > 0:
-            composite_sentiment = (
-                reddit_sentiment * reddit_weight_total * self.reddit_weight +
-                twitter_sentiment * twitter_weight_total * self.twitter_weight
-            ) / total_weight
-        else:
-            composite_sentiment = 0.0
+        weighted_sentiment = (reddit_sentiment * reddit_weight_total * self.reddit_weight +
+                              twitter_sentiment * twitter_weight_total * self.twitter_weight)
+        has_weight = total_weight > 0
+        composite_sentiment = np.where(has_weight, weighted_sentiment / np.where(has_weight, total_weight, 1), 0.0)
         
         # Calculate momentum score (based on mention volume and engagement)
         momentum_score = self._calculate_momentum_score(
@@ -115,80 +138,104 @@ class StockRanker:
             reddit_mentions, twitter_mentions, reddit_weight_total, twitter_weight_total
         )
         
-        return {
-            'symbol': symbol,
-            'composite_score': round(composite_score, 4),
-            'composite_sentiment': round(composite_sentiment, 4),
-            'momentum_score': round(momentum_score, 4),
-            'confidence_score': round(confidence_score, 4),
-            'total_mentions': reddit_mentions + twitter_mentions,
-            'reddit_mentions': reddit_mentions,
-            'twitter_mentions': twitter_mentions,
-            'reddit_sentiment': round(reddit_sentiment, 4),
-            'twitter_sentiment': round(twitter_sentiment, 4),
-            'reddit_positive': round(reddit_positive, 4),
-            'reddit_negative': round(reddit_negative, 4),
-            'twitter_positive': round(twitter_positive, 4),
-            'twitter_negative': round(twitter_negative, 4),
-            'reddit_engagement': reddit_weight_total,
-            'twitter_engagement': twitter_weight_total,
-            'timestamp': datetime.now().isoformat()
-        }
+        # Round every reported score in one pass per metric
+        reported = [composite_score, composite_sentiment, momentum_score, confidence_score,
+                    reddit_sentiment, twitter_sentiment,
+                    column(reddit_symbols, reddit_positions, 'positive', kept),
+                    column(reddit_symbols, reddit_positions, 'negative', kept),
+                    column(twitter_symbols, twitter_positions, 'positive', kept),
+                    column(twitter_symbols, twitter_positions, 'negative', kept)]
+        rounded = [np.round(values, SCORE_DECIMALS) for values in reported]
+        
+        if ranked:
+            # Stable sort keeps first-seen order among equal scores
+            order = np.argsort(-rounded[0], kind='stable')
+            kept = kept[order]
+            rounded = [values[order] for values in rounded]
+        
+        timestamp = datetime.now().isoformat()
+        
+        rows = zip(kept.tolist(), *(values.tolist() for values in rounded))
+        
+        metrics = []
+        for position, (i, composite, sentiment, momentum, confidence, reddit_compound, twitter_compound,
+                       reddit_positive, reddit_negative, twitter_positive, twitter_negative) in enumerate(rows, start=1):
+            symbol = symbols[i]
+            reddit, twitter = reddit_symbols.get(symbol, {}), twitter_symbols.get(symbol, {})
+            reddit_mention_count = reddit.get('mentions', 0)
+            twitter_mention_count = twitter.get('mentions', 0)
+            metrics.append({
+                'symbol': symbol,
+                'composite_score': composite,
+                'composite_sentiment': sentiment,
+                'momentum_score': momentum,
+                'confidence_score': confidence,
+                'total_mentions': reddit_mention_count + twitter_mention_count,
+                'reddit_mentions': reddit_mention_count,
+                'twitter_mentions': twitter_mention_count,
+                'reddit_sentiment': reddit_compound,
+                'twitter_sentiment': twitter_compound,
+                'reddit_positive': reddit_positive,
+                'reddit_negative': reddit_negative,
+                'twitter_positive': twitter_positive,
+                'twitter_negative': twitter_negative,
+                'reddit_engagement': reddit.get('total_weight', 0),
+                'twitter_engagement': twitter.get('total_weight', 0),
+                'timestamp': timestamp
+            })
+            if ranked:
+                metrics[-1]['rank'] = position
+        
+        return metrics
     
-    def _calculate_momentum_score(self, reddit_mentions: int, twitter_mentions: int,
-                                reddit_weight: float, twitter_weight: float) -> float:
+    def _calculate_momentum_score(self, reddit_mentions: np.ndarray, twitter_mentions: np.ndarray,
+                                reddit_weight: np.ndarray, twitter_weight: np.ndarray) -> np.ndarray:
         """
         Calculate momentum score based on mention volume and engagement.
         
         Returns:
-            Normalized momentum score between 0 and 1
+            Normalized momentum scores between 0 and 1
         """
         # Normalize mention counts (logarithmic scaling to handle outliers)
-        import math
-        
-        reddit_momentum = math.log(reddit_mentions + 1) * math.log(reddit_weight + 1)
-        twitter_momentum = math.log(twitter_mentions + 1) * math.log(twitter_weight + 1)
+        reddit_momentum = np.log1p(reddit_mentions) * np.log1p(reddit_weight)
+        twitter_momentum = np.log1p(twitter_mentions) * np.log1p(twitter_weight)
         
         total_momentum = reddit_momentum * self.reddit_weight + twitter_momentum * self.twitter_weight
         
-        # Normalize to 0-1 scale using sigmoid function
-        normalized_momentum = 2 / (1 + math.exp(-total_momentum / 10)) - 1
+        # Normalize to 0-1 scale; 2 / (1 + exp(-x / s)) - 1 is tanh(x / 2s) and never exceeds 1
+        normalized_momentum = np.tanh(total_momentum / (2 * MOMENTUM_SCALE))
         
-        return max(0, min(1, normalized_momentum))
+        return np.maximum(normalized_momentum, 0.0, out=normalized_momentum)
     
-    def _calculate_confidence_score(self, reddit_mentions: int, twitter_mentions: int,
-                                  reddit_weight: float, twitter_weight: float) -> float:
+    def _calculate_confidence_score(self, reddit_mentions: np.ndarray, twitter_mentions: np.ndarray,
+                                  reddit_weight: np.ndarray, twitter_weight: np.ndarray) -> np.ndarray:
         """
         Calculate confidence score based on data quality and quantity.
         
         Returns:
-            Confidence score between 0 and 1
+            Confidence scores between 0 and 1
         """
-        # Minimum thresholds for high confidence
-        min_reddit_mentions = 3
-        min_twitter_mentions = 5
-        min_total_mentions = 8
-        
         total_mentions = reddit_mentions + twitter_mentions
         
         # Base confidence from mention count
-        mention_confidence = min(1.0, total_mentions / min_total_mentions)
+        mention_confidence = total_mentions / MIN_TOTAL_MENTIONS
+        np.minimum(mention_confidence, 1.0, out=mention_confidence)
         
         # Source diversity bonus (having data from both sources increases confidence)
-        source_diversity = 0.5
-        if reddit_mentions >= min_reddit_mentions and twitter_mentions >= min_twitter_mentions:
-            source_diversity = 1.0
-        elif reddit_mentions > 0 and twitter_mentions > 0:
-            source_diversity = 0.8
+        source_diversity = np.select(
+            [(reddit_mentions >= MIN_REDDIT_MENTIONS) & (twitter_mentions >= MIN_TWITTER_MENTIONS),
+             (reddit_mentions > 0) & (twitter_mentions > 0)],
+            [1.0, 0.8],
+            default=0.5
+        )
         
         # Engagement quality (higher engagement = higher confidence)
         total_weight = reddit_weight + twitter_weight
-        engagement_quality = min(1.0, total_weight / 100)  # Normalize based on expected engagement
+        engagement_quality = total_weight / EXPECTED_ENGAGEMENT
+        np.minimum(engagement_quality, 1.0, out=engagement_quality)
         
         # Combined confidence score
-        confidence = (mention_confidence * 0.4 + source_diversity * 0.4 + engagement_quality * 0.2)
-        
-        return round(confidence, 4)
+        return mention_confidence * 0.4 + source_diversity * 0.4 + engagement_quality * 0.2
     
     def get_top_stocks(self, ranked_stocks: List[Dict[str, Any]], count: int = 10) -> List[Dict[str, Any]]:
         """
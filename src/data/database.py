@@ -4,21 +4,53 @@ Database operations for storing and retrieving sentiment analysis data.
 
 import sqlite3
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import weakref
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from ..utils.config import Config
+from ..utils.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Ranking fields stored per stock, in stock_rankings column order
+RANKING_COLUMNS = (
+    'symbol', 'rank', 'composite_score', 'composite_sentiment', 'momentum_score',
+    'confidence_score', 'total_mentions', 'reddit_mentions', 'twitter_mentions',
+    'reddit_sentiment', 'twitter_sentiment', 'reddit_positive', 'reddit_negative',
+    'twitter_positive', 'twitter_negative', 'reddit_engagement', 'twitter_engagement'
+)
+
+# Tables whose row counts are kept in table_counts by insert/delete triggers
+COUNTED_TABLES = ('reddit_posts', 'twitter_tweets', 'stock_rankings', 'symbol_sentiment_history')
+
+# Rows fetched per round trip when streaming long query results
+FETCH_CHUNK_SIZE = 1000
+
+
+def _close_connections(connections: List[sqlite3.Connection], lock: threading.Lock):
+    """Close and forget every connection in a Database's connection list."""
+    with lock:
+        for conn in connections:
+            conn.close()
+        connections.clear()
+
 
 class Database:
     """Database manager for stock sentiment analysis data."""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.db_path = self._get_db_path()
+        
+        # One connection per thread, opened on first use and reused by every call
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        # Close them when the instance is collected, or at exit if it never is
+        weakref.finalize(self, _close_connections, self._connections, self._connections_lock)
+        
         self._initialize_database()
     
     def _get_db_path(self) -> str:
@@ -34,12 +66,35 @@ class Database:
             Path('data').mkdir(exist_ok=True)
             return 'data/stock_sentiment.db'
     
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's database connection, opening it with performance PRAGMAs on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA cache_size=-65536')
+            conn.execute('PRAGMA mmap_size=268435456')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Close every open database connection."""
+        _close_connections(self._connections, self._connections_lock)
+        self._local = threading.local()
+    
     def _initialize_database(self):
         """Initialize database tables."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
+                # Write-ahead logging persists in the database file
+                cursor.execute('PRAGMA journal_mode=WAL')
+                
                 # Reddit posts table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS reddit_posts (
@@ -126,6 +181,46 @@ class Database:
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_twitter_created ON twitter_tweets (created_at)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_rankings_symbol ON stock_rankings (symbol)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_rankings_created ON stock_rankings (created_at)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_ssh_symbol ON symbol_sentiment_history (symbol)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_ssh_created ON symbol_sentiment_history (created_at DESC)')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_ssh_date_symbol
+                    ON symbol_sentiment_history (created_at, symbol, sentiment_compound, mentions)
+                ''')
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_rp_has_sym ON reddit_posts (created_at) WHERE symbols != ''")
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_rankings_created_rank
+                    ON stock_rankings (created_at DESC, rank ASC, symbol)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_rankings_date_symbol
+                    ON stock_rankings (DATE(created_at), symbol, id)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_symbol_history_symbol_created
+                    ON symbol_sentiment_history (symbol, created_at DESC)
+                ''')
+                
+                # Row counts maintained by triggers, so stats never scan the tables
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS table_counts (
+                        name TEXT PRIMARY KEY,
+                        n INTEGER NOT NULL
+                    )
+                ''')
+                counted = {row[0] for row in cursor.execute('SELECT name FROM table_counts')}
+                for table in COUNTED_TABLES:
+                    cursor.execute(f'''
+                        CREATE TRIGGER IF NOT EXISTS {table}_count_insert AFTER INSERT ON {table}
+                        BEGIN UPDATE table_counts SET n = n + 1 WHERE name = '{table}'; END
+                    ''')
+                    cursor.execute(f'''
+                        CREATE TRIGGER IF NOT EXISTS {table}_count_delete AFTER DELETE ON {table}
+                        BEGIN UPDATE table_counts SET n = n - 1 WHERE name = '{table}'; END
+                    ''')
+                    if table not in counted:
+                        # Seed once from the rows stored before the triggers existed
+                        cursor.execute(f'INSERT INTO table_counts (name, n) SELECT ?, COUNT(*) FROM {table}', (table,))
                 
                 conn.commit()
                 logger.info("Database initialized successfully")
@@ -137,21 +232,26 @@ class Database:
     def store_reddit_data(self, reddit_sentiment: Dict[str, Any]):
         """Store Reddit sentiment analysis data."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._connect() as conn:
+                conn.execute('BEGIN IMMEDIATE')
                 
                 posts = reddit_sentiment.get('posts', [])
-                for post in posts:
-                    sentiment = post.get('sentiment', {})
-                    symbols_str = ','.join(post.get('symbols', []))
-                    
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO reddit_posts
-                        (id, title, text, score, upvote_ratio, num_comments, created_utc,
-                         author, symbols, url, sentiment_positive, sentiment_negative,
-                         sentiment_neutral, sentiment_compound)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
+                conn.executemany('''
+                    INSERT INTO reddit_posts
+                    (id, title, text, score, upvote_ratio, num_comments, created_utc,
+                     author, symbols, url, sentiment_positive, sentiment_negative,
+                     sentiment_neutral, sentiment_compound)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        score = excluded.score,
+                        upvote_ratio = excluded.upvote_ratio,
+                        num_comments = excluded.num_comments,
+                        sentiment_positive = excluded.sentiment_positive,
+                        sentiment_negative = excluded.sentiment_negative,
+                        sentiment_neutral = excluded.sentiment_neutral,
+                        sentiment_compound = excluded.sentiment_compound
+                ''', [
+                    (
                         post.get('id'),
                         post.get('title'),
                         post.get('text'),
@@ -160,28 +260,15 @@ class Database:
                         post.get('num_comments', 0),
                         post.get('created_utc'),
                         post.get('author'),
-                        symbols_str,
+                        ','.join(post.get('symbols', [])),
                         post.get('url'),
-                        sentiment.get('positive', 0.0),
-                        sentiment.get('negative', 0.0),
-                        sentiment.get('neutral', 0.0),
-                        sentiment.get('compound', 0.0)
-                    ))
+                        *self._sentiment_columns(post.get('sentiment', {}))
+                    )
+                    for post in posts
+                ])
                 
                 # Store symbol sentiment history
-                symbol_sentiment = reddit_sentiment.get('symbol_sentiment', {})
-                for symbol, data in symbol_sentiment.items():
-                    cursor.execute('''
-                        INSERT INTO symbol_sentiment_history
-                        (symbol, source, sentiment_compound, mentions, engagement_weight)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        symbol,
-                        'reddit',
-                        data.get('compound', 0.0),
-                        data.get('mentions', 0),
-                        data.get('total_weight', 0.0)
-                    ))
+                self._store_symbol_history(conn, 'reddit', reddit_sentiment.get('symbol_sentiment', {}))
                 
                 conn.commit()
                 logger.info(f"Stored {len(posts)} Reddit posts")
@@ -192,50 +279,43 @@ class Database:
     def store_twitter_data(self, twitter_sentiment: Dict[str, Any]):
         """Store Twitter sentiment analysis data."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._connect() as conn:
+                conn.execute('BEGIN IMMEDIATE')
                 
                 tweets = twitter_sentiment.get('tweets', [])
-                for tweet in tweets:
-                    sentiment = tweet.get('sentiment', {})
-                    symbols_str = ','.join(tweet.get('symbols', []))
-                    
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO twitter_tweets
-                        (id, text, created_at, author_id, symbols, retweet_count,
-                         like_count, reply_count, quote_count, sentiment_positive,
-                         sentiment_negative, sentiment_neutral, sentiment_compound)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
+                conn.executemany('''
+                    INSERT INTO twitter_tweets
+                    (id, text, created_at, author_id, symbols, retweet_count,
+                     like_count, reply_count, quote_count, sentiment_positive,
+                     sentiment_negative, sentiment_neutral, sentiment_compound)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        retweet_count = excluded.retweet_count,
+                        like_count = excluded.like_count,
+                        reply_count = excluded.reply_count,
+                        quote_count = excluded.quote_count,
+                        sentiment_positive = excluded.sentiment_positive,
+                        sentiment_negative = excluded.sentiment_negative,
+                        sentiment_neutral = excluded.sentiment_neutral,
+                        sentiment_compound = excluded.sentiment_compound
+                ''', [
+                    (
                         tweet.get('id'),
                         tweet.get('text'),
                         tweet.get('created_at'),
                         tweet.get('author_id'),
-                        symbols_str,
+                        ','.join(tweet.get('symbols', [])),
                         tweet.get('retweet_count', 0),
                         tweet.get('like_count', 0),
                         tweet.get('reply_count', 0),
                         tweet.get('quote_count', 0),
-                        sentiment.get('positive', 0.0),
-                        sentiment.get('negative', 0.0),
-                        sentiment.get('neutral', 0.0),
-                        sentiment.get('compound', 0.0)
-                    ))
+                        *self._sentiment_columns(tweet.get('sentiment', {}))
+                    )
+                    for tweet in tweets
+                ])
                 
                 # Store symbol sentiment history
-                symbol_sentiment = twitter_sentiment.get('symbol_sentiment', {})
-                for symbol, data in symbol_sentiment.items():
-                    cursor.execute('''
-                        INSERT INTO symbol_sentiment_history
-                        (symbol, source, sentiment_compound, mentions, engagement_weight)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        symbol,
-                        'twitter',
-                        data.get('compound', 0.0),
-                        data.get('mentions', 0),
-                        data.get('total_weight', 0.0)
-                    ))
+                self._store_symbol_history(conn, 'twitter', twitter_sentiment.get('symbol_sentiment', {}))
                 
                 conn.commit()
                 logger.info(f"Stored {len(tweets)} tweets")
@@ -243,39 +323,49 @@ class Database:
         except Exception as e:
             logger.error(f"Error storing Twitter data: {e}")
     
+    @staticmethod
+    def _sentiment_columns(sentiment: Dict[str, float]) -> Tuple[float, float, float, float]:
+        """Get the positive, negative, neutral and compound columns of a sentiment score."""
+        return (
+            sentiment.get('positive', 0.0),
+            sentiment.get('negative', 0.0),
+            sentiment.get('neutral', 0.0),
+            sentiment.get('compound', 0.0)
+        )
+    
+    def _store_symbol_history(self, conn: sqlite3.Connection, source: str, symbol_sentiment: Dict[str, Dict]):
+        """Append one sentiment history row per symbol in a single batch."""
+        conn.executemany('''
+            INSERT INTO symbol_sentiment_history
+            (symbol, source, sentiment_compound, mentions, engagement_weight)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (
+                symbol,
+                source,
+                data.get('compound', 0.0),
+                data.get('mentions', 0),
+                data.get('total_weight', 0.0)
+            )
+            for symbol, data in symbol_sentiment.items()
+        ])
+    
     def store_rankings(self, rankings: List[Dict[str, Any]]):
         """Store stock rankings."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                for stock in rankings:
-                    cursor.execute('''
-                        INSERT INTO stock_rankings
-                        (symbol, rank, composite_score, composite_sentiment, momentum_score,
-                         confidence_score, total_mentions, reddit_mentions, twitter_mentions,
-                         reddit_sentiment, twitter_sentiment, reddit_positive, reddit_negative,
-                         twitter_positive, twitter_negative, reddit_engagement, twitter_engagement)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        stock.get('symbol'),
-                        stock.get('rank'),
-                        stock.get('composite_score'),
-                        stock.get('composite_sentiment'),
-                        stock.get('momentum_score'),
-                        stock.get('confidence_score'),
-                        stock.get('total_mentions'),
-                        stock.get('reddit_mentions'),
-                        stock.get('twitter_mentions'),
-                        stock.get('reddit_sentiment'),
-                        stock.get('twitter_sentiment'),
-                        stock.get('reddit_positive'),
-                        stock.get('reddit_negative'),
-                        stock.get('twitter_positive'),
-                        stock.get('twitter_negative'),
-                        stock.get('reddit_engagement'),
-                        stock.get('twitter_engagement')
-                    ))
+            with self._connect() as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.executemany('''
+                    INSERT INTO stock_rankings
+                    (symbol, rank, composite_score, composite_sentiment, momentum_score,
+                     confidence_score, total_mentions, reddit_mentions, twitter_mentions,
+                     reddit_sentiment, twitter_sentiment, reddit_positive, reddit_negative,
+                     twitter_positive, twitter_negative, reddit_engagement, twitter_engagement)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    tuple(stock.get(column) for column in RANKING_COLUMNS)
+                    for stock in rankings
+                ])
                 
                 conn.commit()
                 logger.info(f"Stored rankings for {len(rankings)} stocks")
@@ -286,26 +376,21 @@ class Database:
     def get_latest_rankings(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get the most recent stock rankings."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
                     SELECT * FROM stock_rankings
                     WHERE created_at = (
-                        SELECT MAX(created_at) FROM stock_rankings
+                        SELECT created_at FROM stock_rankings
+                        ORDER BY created_at DESC
+                        LIMIT 1
                     )
                     ORDER BY rank
                     LIMIT ?
                 ''', (limit,))
                 
-                columns = [description[0] for description in cursor.description]
-                rankings = []
-                
-                for row in cursor.fetchall():
-                    ranking = dict(zip(columns, row))
-                    rankings.append(ranking)
-                
-                return rankings
+                return [dict(row) for row in cursor]
                 
         except Exception as e:
             logger.error(f"Error getting latest rankings: {e}")
@@ -314,7 +399,7 @@ class Database:
     def get_symbol_history(self, symbol: str, days: int = 7) -> List[Dict[str, Any]]:
         """Get historical sentiment data for a symbol."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 cutoff_date = datetime.now() - timedelta(days=days)
@@ -325,12 +410,12 @@ class Database:
                     ORDER BY created_at DESC
                 ''', (symbol, cutoff_date))
                 
-                columns = [description[0] for description in cursor.description]
                 history = []
-                
-                for row in cursor.fetchall():
-                    record = dict(zip(columns, row))
-                    history.append(record)
+                while True:
+                    rows = cursor.fetchmany(FETCH_CHUNK_SIZE)
+                    if not rows:
+                        break
+                    history.extend(dict(row) for row in rows)
                 
                 return history
                 
@@ -341,7 +426,7 @@ class Database:
     def cleanup_old_data(self, days: int = 30):
         """Clean up old data beyond specified days."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 cutoff_date = datetime.now() - timedelta(days=days)
@@ -351,16 +436,18 @@ class Database:
                 cursor.execute('DELETE FROM twitter_tweets WHERE created_at < ?', (cutoff_date,))
                 cursor.execute('DELETE FROM symbol_sentiment_history WHERE created_at < ?', (cutoff_date,))
                 
-                # Keep only latest ranking per day for historical analysis
+                # Keep only latest ranking per day for historical analysis; the keep set
+                # is read once from idx_rankings_date_symbol
                 cursor.execute('''
-                    DELETE FROM stock_rankings 
-                    WHERE created_at < ? 
-                    AND id NOT IN (
-                        SELECT MIN(id) 
-                        FROM stock_rankings 
+                    WITH keep AS (
+                        SELECT MIN(id) AS id
+                        FROM stock_rankings
                         WHERE created_at < ?
                         GROUP BY DATE(created_at), symbol
                     )
+                    DELETE FROM stock_rankings
+                    WHERE created_at < ?
+                    AND id NOT IN (SELECT id FROM keep)
                 ''', (cutoff_date, cutoff_date))
                 
                 conn.commit()
@@ -372,18 +459,13 @@ class Database:
     def get_database_stats(self) -> Dict[str, int]:
         """Get database statistics."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
-                stats = {}
-                
-                # Count records in each table
-                tables = ['reddit_posts', 'twitter_tweets', 'stock_rankings', 'symbol_sentiment_history']
-                for table in tables:
-                    cursor.execute(f'SELECT COUNT(*) FROM {table}')
-                    stats[table] = cursor.fetchone()[0]
+                # Record counts are maintained by triggers on each table
+                counts = {row[0]: row[1] for row in cursor.execute('SELECT name, n FROM table_counts')}
                 
-                return stats
+                return {table: counts.get(table, 0) for table in COUNTED_TABLES}
                 
         except Exception as e:
             logger.error(f"Error getting database stats: {e}")
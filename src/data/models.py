@@ -2,12 +2,12 @@
 Data models for the stock sentiment analysis project.
 """
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class SentimentScore:
     """Sentiment analysis results."""
     positive: float
@@ -16,7 +16,7 @@ class SentimentScore:
     compound: float
 
 
-@dataclass
+@dataclass(slots=True)
 class RedditPost:
     """Reddit post data model."""
     id: str
@@ -33,7 +33,7 @@ class RedditPost:
     source: str = 'reddit'
 
 
-@dataclass
+@dataclass(slots=True)
 class Tweet:
     """Twitter tweet data model."""
     id: str
@@ -49,7 +49,7 @@ class Tweet:
     source: str = 'twitter'
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolSentiment:
     """Aggregated sentiment data for a stock symbol."""
     symbol: str
@@ -61,7 +61,26 @@ class SymbolSentiment:
     source: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class StockMention:
+    """Mention count and sentiment of a stock symbol at a point in time."""
+    symbol: str
+    mentions: int
+    sentiment_score: float
+    timestamp: str
+    
+    def __getitem__(self, key: str) -> Any:
+        """Read a field by name, for callers written against the old mention dict."""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert to the mention dict format_stock_mention used to return."""
+        return asdict(self)
+
+
+@dataclass(slots=True)
 class StockRanking:
     """Stock ranking with comprehensive metrics."""
     symbol: str
@@ -84,7 +103,7 @@ class StockRanking:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Complete analysis result containing all data."""
     reddit_data: Dict[str, Any]
@@ -96,7 +115,24 @@ class AnalysisResult:
     symbols_analyzed: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
+class DailyResult:
+    """Daily analysis summary saved for historical tracking."""
+    date: str
+    timestamp: str
+    analysis_mode: str
+    total_posts: int
+    total_stocks: int
+    average_confidence: float
+    top_rankings: List[Dict[str, Any]]
+    sentiment_distribution: Dict[str, Any]
+    confidence_breakdown: Dict[str, Any]
+    data_sources: Dict[str, Any]
+    backtesting_accuracy: float
+    total_mentions: int
+
+
+@dataclass(slots=True)
 class ApiCredentials:
     """API credentials container."""
     reddit_client_id: Optional[str] = None
@@ -109,14 +145,14 @@ class ApiCredentials:
     twitter_access_token_secret: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisConfig:
     """Configuration for analysis parameters."""
     reddit_subreddit: str = 'wallstreetbets'
     reddit_sort_by: str = 'hot'
     reddit_limit: int = 100
     reddit_time_filter: str = 'day'
-    twitter_search_terms: List[str] = None
+    twitter_search_terms: List[str] = field(default_factory=lambda: ['$SPY', '$AAPL', '$TSLA', '$NVDA'])
     twitter_max_tweets: int = 500
     twitter_include_retweets: bool = False
     sentiment_model: str = 'vader'
@@ -133,76 +169,73 @@ class AnalysisConfig:
 
 def convert_dict_to_sentiment_score(data: Dict[str, float]) -> SentimentScore:
     """Convert dictionary to SentimentScore object."""
-    return SentimentScore(
-        positive=data.get('positive', 0.0),
-        negative=data.get('negative', 0.0),
-        neutral=data.get('neutral', 0.0),
-        compound=data.get('compound', 0.0)
-    )
+    get = data.get
+    return SentimentScore(get('positive', 0.0), get('negative', 0.0), get('neutral', 0.0), get('compound', 0.0))
 
 
 def convert_dict_to_reddit_post(data: Dict[str, Any]) -> RedditPost:
     """Convert dictionary to RedditPost object."""
-    sentiment = None
-    if 'sentiment' in data:
-        sentiment = convert_dict_to_sentiment_score(data['sentiment'])
+    get = data.get
     
+    # Positional arguments in field order; the clock is only read when no timestamp is given
     return RedditPost(
-        id=data.get('id', ''),
-        title=data.get('title', ''),
-        text=data.get('text', ''),
-        score=data.get('score', 0),
-        upvote_ratio=data.get('upvote_ratio', 0.5),
-        num_comments=data.get('num_comments', 0),
-        created_utc=data.get('created_utc', datetime.now()),
-        author=data.get('author', ''),
-        symbols=data.get('symbols', []),
-        url=data.get('url', ''),
-        sentiment=sentiment,
-        source=data.get('source', 'reddit')
+        get('id', ''),
+        get('title', ''),
+        get('text', ''),
+        get('score', 0),
+        get('upvote_ratio', 0.5),
+        get('num_comments', 0),
+        data['created_utc'] if 'created_utc' in data else datetime.now(),
+        get('author', ''),
+        get('symbols', []),
+        get('url', ''),
+        convert_dict_to_sentiment_score(data['sentiment']) if 'sentiment' in data else None,
+        get('source', 'reddit')
     )
 
 
 def convert_dict_to_tweet(data: Dict[str, Any]) -> Tweet:
     """Convert dictionary to Tweet object."""
-    sentiment = None
-    if 'sentiment' in data:
-        sentiment = convert_dict_to_sentiment_score(data['sentiment'])
+    get = data.get
     
+    # Positional arguments in field order; the clock is only read when no timestamp is given
     return Tweet(
-        id=data.get('id', ''),
-        text=data.get('text', ''),
-        created_at=data.get('created_at', datetime.now()),
-        author_id=data.get('author_id', ''),
-        symbols=data.get('symbols', []),
-        retweet_count=data.get('retweet_count', 0),
-        like_count=data.get('like_count', 0),
-        reply_count=data.get('reply_count', 0),
-        quote_count=data.get('quote_count', 0),
-        sentiment=sentiment,
-        source=data.get('source', 'twitter')
+        get('id', ''),
+        get('text', ''),
+        data['created_at'] if 'created_at' in data else datetime.now(),
+        get('author_id', ''),
+        get('symbols', []),
+        get('retweet_count', 0),
+        get('like_count', 0),
+        get('reply_count', 0),
+        get('quote_count', 0),
+        convert_dict_to_sentiment_score(data['sentiment']) if 'sentiment' in data else None,
+        get('source', 'twitter')
     )
 
 
 def convert_dict_to_stock_ranking(data: Dict[str, Any]) -> StockRanking:
     """Convert dictionary to StockRanking object."""
+    get = data.get
+    
+    # Positional arguments in field order; the clock is only read when no timestamp is given
     return StockRanking(
-        symbol=data.get('symbol', ''),
-        rank=data.get('rank', 0),
-        composite_score=data.get('composite_score', 0.0),
-        composite_sentiment=data.get('composite_sentiment', 0.0),
-        momentum_score=data.get('momentum_score', 0.0),
-        confidence_score=data.get('confidence_score', 0.0),
-        total_mentions=data.get('total_mentions', 0),
-        reddit_mentions=data.get('reddit_mentions', 0),
-        twitter_mentions=data.get('twitter_mentions', 0),
-        reddit_sentiment=data.get('reddit_sentiment', 0.0),
-        twitter_sentiment=data.get('twitter_sentiment', 0.0),
-        reddit_positive=data.get('reddit_positive', 0.0),
-        reddit_negative=data.get('reddit_negative', 0.0),
-        twitter_positive=data.get('twitter_positive', 0.0),
-        twitter_negative=data.get('twitter_negative', 0.0),
-        reddit_engagement=data.get('reddit_engagement', 0.0),
-        twitter_engagement=data.get('twitter_engagement', 0.0),
-        timestamp=data.get('timestamp', datetime.now())
+        get('symbol', ''),
+        get('rank', 0),
+        get('composite_score', 0.0),
+        get('composite_sentiment', 0.0),
+        get('momentum_score', 0.0),
+        get('confidence_score', 0.0),
+        get('total_mentions', 0),
+        get('reddit_mentions', 0),
+        get('twitter_mentions', 0),
+        get('reddit_sentiment', 0.0),
+        get('twitter_sentiment', 0.0),
+        get('reddit_positive', 0.0),
+        get('reddit_negative', 0.0),
+        get('twitter_positive', 0.0),
+        get('twitter_negative', 0.0),
+        get('reddit_engagement', 0.0),
+        get('twitter_engagement', 0.0),
+        data['timestamp'] if 'timestamp' in data else datetime.now()
     )
@@ -0,0 +1,219 @@
+"""
+SQLite-backed cache of daily closing prices fetched from yfinance.
+"""
+
+import sqlite3
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta
+from datetime import time as dt_time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+try:
+    import yfinance as yf
+    YFINANCE_AVAILABLE = True
+except ImportError:
+    YFINANCE_AVAILABLE = False
+    logging.warning("yfinance not available. Install with: pip install yfinance")
+
+logger = logging.getLogger(__name__)
+
+# Concurrent yf.download calls when symbols need different date ranges
+DOWNLOAD_WORKERS = 4
+
+# Cached prices go stale quickly while the market is open and slowly otherwise
+MARKET_HOURS_TTL = 15 * 60
+OFF_HOURS_TTL = 24 * 60 * 60
+MARKET_TIMEZONE = ZoneInfo('America/New_York')
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+
+
+class PriceCache:
+    """Cache of daily closing prices keyed by (symbol, date)."""
+
+    def __init__(self, db_path: str = "data/stock_sentiment.db"):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._initialize_cache()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a cache connection tuned for batched inserts."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _initialize_cache(self):
+        """Initialize price cache tables."""
+        with self._connect() as conn:
+            # Write-ahead logging persists in the database file
+            conn.execute('PRAGMA journal_mode=WAL')
+
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS price_cache (
+                    symbol TEXT,
+                    dt DATE,
+                    close REAL,
+                    fetched_at INTEGER,
+                    PRIMARY KEY (symbol, dt)
+                )
+            ''')
+
+            # Date range covered by the latest download of each symbol
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS price_cache_fetches (
+                    symbol TEXT PRIMARY KEY,
+                    start_dt DATE,
+                    end_dt DATE,
+                    fetched_at INTEGER
+                )
+            ''')
+
+    @staticmethod
+    def _cache_ttl() -> int:
+        """Get the cache time-to-live in seconds for the current time."""
+        now = datetime.now(MARKET_TIMEZONE)
+        if now.weekday() < 5 and MARKET_OPEN <= now.time() <= MARKET_CLOSE:
+            return MARKET_HOURS_TTL
+        return OFF_HOURS_TTL
+
+    def get_close_prices(self, symbols: List[str], start: Union[datetime, date],
+                         end: Union[datetime, date]) -> pd.DataFrame:
+        """
+        Get daily closing prices, downloading only the date ranges missing from the cache.
+
+        Args:
+            symbols: List of stock symbols
+            start: First date of the price window
+            end: Last date of the price window (inclusive, so today's bar is kept)
+
+        Returns:
+            DataFrame of closing prices indexed by date with one column per symbol
+        """
+        if not symbols:
+            return pd.DataFrame()
+
+        start_dt = pd.Timestamp(start).date().isoformat()
+        # Exclusive bound the day after end, as yf.download and the query below expect
+        end_dt = (pd.Timestamp(end).date() + timedelta(days=1)).isoformat()
+        fresh_after = int(time.time()) - self._cache_ttl()
+        placeholders = ','.join('?' * len(symbols))
+
+        with self._connect() as conn:
+            fetches = {
+                row[0]: row[1:] for row in conn.execute(f'''
+                    SELECT f.symbol, f.start_dt, f.end_dt, f.fetched_at, MAX(p.dt)
+                    FROM price_cache_fetches f
+                    LEFT JOIN price_cache p ON p.symbol = f.symbol
+                    WHERE f.symbol IN ({placeholders})
+                    GROUP BY f.symbol
+                ''', symbols)
+            }
+
+            # Group symbols by the first date they need, so each group is one download
+            missing = {}
+            for symbol in symbols:
+                covered_start, covered_end, fetched_at, last_dt = fetches.get(symbol, (None,) * 4)
+                # A window starting after the last cached day would leave a gap; download it whole
+                if covered_start is None or covered_start > start_dt or last_dt is None or last_dt < start_dt:
+                    missing.setdefault(start_dt, {})[symbol] = (start_dt, end_dt)
+                elif (covered_end < end_dt or fetched_at < fresh_after) and last_dt < end_dt:
+                    # Closes before the last cached day are final; refetch from that day on
+                    fetch_start = max(start_dt, last_dt)
+                    missing.setdefault(fetch_start, {})[symbol] = (covered_start, max(covered_end, end_dt))
+
+            if missing:
+                # Overlap the download groups; SQLite writes stay on this thread
+                with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(missing))) as executor:
+                    downloads = list(executor.map(
+                        lambda fetch_start: self._download(list(missing[fetch_start]), fetch_start, end_dt),
+                        missing
+                    ))
+                for (fetch_start, coverage), closes in zip(missing.items(), downloads):
+                    if closes is not None:
+                        self._store(conn, closes, coverage, fetch_start)
+
+            rows = conn.execute(f'''
+                SELECT dt, symbol, close FROM price_cache
+                WHERE symbol IN ({placeholders}) AND dt >= ? AND dt < ?
+            ''', (*symbols, start_dt, end_dt)).fetchall()
+
+        if not rows:
+            return pd.DataFrame()
+
+        closes = pd.DataFrame(rows, columns=['dt', 'symbol', 'close'])
+        closes = closes.pivot(index='dt', columns='symbol', values='close')
+        closes.index = pd.to_datetime(closes.index)
+        closes.columns.name = None
+        return closes.sort_index()
+
+    def _download(self, symbols: List[str], start_dt: str, end_dt: str) -> Optional[pd.DataFrame]:
+        """
+        Download closing prices for symbols in one batched request.
+
+        Args:
+            symbols: List of stock symbols
+            start_dt: First date to download
+            end_dt: End of the download window (exclusive)
+
+        Returns:
+            DataFrame of closing prices with one column per symbol, or None if nothing was found
+        """
+        if not YFINANCE_AVAILABLE:
+            logger.error("yfinance not available for price data")
+            return None
+
+        try:
+            data = yf.download(symbols, start=start_dt, end=end_dt, group_by='ticker',
+                               threads=True, progress=False)
+        except Exception as e:
+            logger.error(f"Error downloading price data for {symbols}: {e}")
+            return None
+
+        if data is None or data.empty:
+            logger.warning(f"No price data found for {symbols}")
+            return None
+
+        if not isinstance(data.columns, pd.MultiIndex):
+            data.columns = pd.MultiIndex.from_product([symbols, data.columns])
+
+        return data.xs('Close', axis=1, level=1)
+
+    def _store(self, conn: sqlite3.Connection, closes: pd.DataFrame,
+               coverage: Dict[str, Tuple[str, str]], start_dt: str):
+        """
+        Store downloaded closing prices and the range each symbol now covers.
+
+        Args:
+            conn: Open cache connection
+            closes: Downloaded closing prices with one column per symbol
+            coverage: Cached (start, end) range of each symbol once the download is stored
+            start_dt: First date of the download
+        """
+        fetched_at = int(time.time())
+
+        downloaded = []
+        for symbol in closes.columns:
+            series = closes[symbol].dropna()
+            if series.empty:
+                logger.warning(f"No price data found for {symbol}")
+                continue
+
+            conn.executemany('''
+                INSERT OR REPLACE INTO price_cache (symbol, dt, close, fetched_at)
+                VALUES (?, ?, ?, ?)
+            ''', [(symbol, day.date().isoformat(), float(close), fetched_at)
+                  for day, close in series.items()])
+            downloaded.append((symbol, *coverage[symbol], fetched_at))
+
+        conn.executemany('''
+            INSERT OR REPLACE INTO price_cache_fetches (symbol, start_dt, end_dt, fetched_at)
+            VALUES (?, ?, ?, ?)
+        ''', downloaded)
+        conn.commit()
+        logger.info(f"Downloaded price data from {start_dt} for {len(downloaded)} of {len(coverage)} symbols")
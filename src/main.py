@@ -7,7 +7,7 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
-from src.utils.config import Config
+from src.utils.config import get_config
 from src.scrapers.reddit_scraper import RedditScraper
 from src.scrapers.twitter_scraper import TwitterScraper
 from src.analysis.sentiment_analyzer import SentimentAnalyzer
@@ -26,7 +26,7 @@ class StockSentimentAnalyzer:
     """Main application class for stock sentiment analysis."""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.db = Database()
         self.reddit_scraper = RedditScraper()
         self.twitter_scraper = TwitterScraper()
@@ -68,19 +68,11 @@ class StockSentimentAnalyzer:
             self._configure_comprehensive_collection()
         
         try:
-            # Scrape data from Reddit
-            logger.info("Scraping Reddit data...")
-            reddit_data = await self.reddit_scraper.scrape_wallstreetbets()
-            
-            # If we're in extended mode, also get recent hot posts
-            if collection_mode in ["extended", "comprehensive"]:
-                logger.info("Scraping additional recent hot posts...")
-                hot_data = await self.reddit_scraper.scrape_recent_hot_posts()
-                reddit_data.extend(hot_data)
-            
-            # Scrape data from Twitter
-            logger.info("Scraping Twitter data...")
-            twitter_data = await self.twitter_scraper.scrape_stock_tweets()
+            # Scrape Reddit and Twitter concurrently
+            reddit_data, twitter_data = await asyncio.gather(
+                self._scrape_reddit(collection_mode),
+                self._scrape_twitter()
+            )
             
             # Analyze sentiment
             logger.info("Analyzing sentiment...")
@@ -108,6 +100,24 @@ class StockSentimentAnalyzer:
             logger.error(f"Error during analysis: {e}")
             raise
     
+    async def _scrape_reddit(self, collection_mode: str):
+        """Scrape Reddit posts; requests run one after another because praw is not thread-safe."""
+        logger.info("Scraping Reddit data...")
+        reddit_data = await self.reddit_scraper.scrape_wallstreetbets()
+        
+        # If we're in extended mode, also get recent hot posts
+        if collection_mode in ["extended", "comprehensive"]:
+            logger.info("Scraping additional recent hot posts...")
+            hot_data = await self.reddit_scraper.scrape_recent_hot_posts()
+            reddit_data.extend(hot_data)
+        
+        return reddit_data
+    
+    async def _scrape_twitter(self):
+        """Scrape stock-related tweets."""
+        logger.info("Scraping Twitter data...")
+        return await self.twitter_scraper.scrape_stock_tweets()
+    
     def get_latest_rankings(self):
         """Get the most recent stock rankings."""
         return self.db.get_latest_rankings()
@@ -4,6 +4,7 @@ Reddit scraper for r/WallStreetBets sentiment analysis.
 
 import asyncio
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any
 from datetime import datetime
 
@@ -12,18 +13,29 @@ try:
 except ImportError:
     praw = None
 
-from ..utils.config import Config
+from ..utils.config import get_config
 from ..utils.helpers import extract_stock_symbols, clean_text
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_reddit(client_id: str, client_secret: str, user_agent: str):
+    """Create the praw client once per set of credentials and share it across scrapers."""
+    return praw.Reddit(
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent=user_agent
+    )
+
+
 class RedditScraper:
     """Scraper for Reddit r/WallStreetBets posts."""
     
     def __init__(self):
-        self.config = Config()
-        self.reddit_config = self.config.reddit_config
+        self.config = get_config()
+        # Own copy, so per-run overrides never leak into the shared configuration
+        self.reddit_config = dict(self.config.reddit_config)
         self.credentials = self.config.reddit_credentials
         self.reddit = self._initialize_reddit()
     
@@ -38,15 +50,13 @@ class RedditScraper:
             return None
         
         try:
-            reddit = praw.Reddit(
-                client_id=self.credentials['client_id'],
-                client_secret=self.credentials['client_secret'],
-                user_agent=self.credentials['user_agent']
+            # No test request here: authentication errors surface on the first scrape
+            reddit = _get_reddit(
+                self.credentials['client_id'],
+                self.credentials['client_secret'],
+                self.credentials['user_agent']
             )
-            
-            # Test connection
-            reddit.user.me()
-            logger.info("Reddit API connection established successfully")
+            logger.info("Reddit API client initialized")
             return reddit
             
         except Exception as e:
@@ -60,6 +70,11 @@ class RedditScraper:
         Returns:
             List of post data dictionaries
         """
+        # praw blocks on network I/O; keep it off the event loop
+        return await asyncio.to_thread(self._scrape_wallstreetbets)
+    
+    def _scrape_wallstreetbets(self) -> List[Dict[str, Any]]:
+        """Scrape posts from r/WallStreetBets, blocking until done."""
         if not self.reddit:
             logger.error("Reddit API not initialized")
             return []
@@ -86,10 +101,8 @@ class RedditScraper:
                 posts = subreddit.hot(limit=limit)
             
             for post in posts:
-                # Extract stock symbols from title and text
-                title_symbols = extract_stock_symbols(post.title)
-                text_symbols = extract_stock_symbols(post.selftext or '')
-                all_symbols = list(set(title_symbols + text_symbols))
+                # Extract stock symbols from title and text in one scan; a symbol can't span the newline
+                all_symbols = extract_stock_symbols(f"{post.title}\n{post.selftext or ''}")
                 
                 if all_symbols:  # Only include posts mentioning stocks
                     post_data = {
@@ -124,6 +137,10 @@ class RedditScraper:
         Returns:
             List of post data dictionaries
         """
+        return await asyncio.to_thread(self._scrape_recent_hot_posts, limit)
+    
+    def _scrape_recent_hot_posts(self, limit: int) -> List[Dict[str, Any]]:
+        """Scrape recent hot posts, blocking until done."""
         if not self.reddit:
             logger.error("Reddit API not initialized")
             return []
@@ -136,10 +153,8 @@ class RedditScraper:
             posts = subreddit.hot(limit=limit)
             
             for post in posts:
-                # Extract stock symbols from title and text
-                title_symbols = extract_stock_symbols(post.title)
-                text_symbols = extract_stock_symbols(post.selftext or '')
-                all_symbols = list(set(title_symbols + text_symbols))
+                # Extract stock symbols from title and text in one scan; a symbol can't span the newline
+                all_symbols = extract_stock_symbols(f"{post.title}\n{post.selftext or ''}")
                 
                 if all_symbols:  # Only include posts mentioning stocks
                     post_data = {
@@ -175,6 +190,10 @@ class RedditScraper:
         Returns:
             List of comment data dictionaries
         """
+        return await asyncio.to_thread(self._get_post_comments, post_id, limit)
+    
+    def _get_post_comments(self, post_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Get comments for a specific post, blocking until done."""
         if not self.reddit:
             return []
         
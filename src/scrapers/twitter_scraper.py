@@ -4,6 +4,7 @@ Twitter scraper for stock sentiment analysis.
 
 import asyncio
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 
@@ -12,18 +13,33 @@ try:
 except ImportError:
     tweepy = None
 
-from ..utils.config import Config
+from ..utils.config import get_config
 from ..utils.helpers import extract_stock_symbols, clean_text
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_twitter(bearer_token: str, api_key: str, api_secret: str,
+                 access_token: str, access_token_secret: str):
+    """Create the tweepy API v2 client once per set of credentials and share it across scrapers."""
+    return tweepy.Client(
+        bearer_token=bearer_token,
+        consumer_key=api_key,
+        consumer_secret=api_secret,
+        access_token=access_token,
+        access_token_secret=access_token_secret,
+        wait_on_rate_limit=True
+    )
+
+
 class TwitterScraper:
     """Scraper for Twitter stock-related tweets."""
     
     def __init__(self):
-        self.config = Config()
-        self.twitter_config = self.config.twitter_config
+        self.config = get_config()
+        # Own copy, so per-run overrides never leak into the shared configuration
+        self.twitter_config = dict(self.config.twitter_config)
         self.credentials = self.config.twitter_credentials
         self.api = self._initialize_twitter()
     
@@ -38,25 +54,29 @@ class TwitterScraper:
             return None
         
         try:
-            # Initialize Twitter API v2
-            client = tweepy.Client(
-                bearer_token=self.credentials['bearer_token'],
-                consumer_key=self.credentials['api_key'],
-                consumer_secret=self.credentials['api_secret'],
-                access_token=self.credentials['access_token'],
-                access_token_secret=self.credentials['access_token_secret'],
-                wait_on_rate_limit=True
+            # No test request here: authentication errors surface on the first search
+            client = _get_twitter(
+                self.credentials['bearer_token'],
+                self.credentials['api_key'],
+                self.credentials['api_secret'],
+                self.credentials['access_token'],
+                self.credentials['access_token_secret']
             )
-            
-            # Test connection
-            me = client.get_me()
-            logger.info("Twitter API connection established successfully")
+            logger.info("Twitter API client initialized")
             return client
             
         except Exception as e:
             logger.error(f"Failed to initialize Twitter API: {e}")
             return None
     
+    @staticmethod
+    def _add_public_metrics(tweet_data: Dict[str, Any], public_metrics: Dict[str, int]):
+        """Copy a tweet's engagement counts into its data dictionary in place."""
+        tweet_data['retweet_count'] = public_metrics.get('retweet_count', 0)
+        tweet_data['like_count'] = public_metrics.get('like_count', 0)
+        tweet_data['reply_count'] = public_metrics.get('reply_count', 0)
+        tweet_data['quote_count'] = public_metrics.get('quote_count', 0)
+    
     async def scrape_stock_tweets(self) -> List[Dict[str, Any]]:
         """
         Scrape stock-related tweets.
@@ -68,7 +88,6 @@ class TwitterScraper:
             logger.error("Twitter API not initialized")
             return []
         
-        tweets_data = []
         search_terms = self.twitter_config.get('search_terms', ['$SPY', '$AAPL'])
         max_tweets = self.twitter_config.get('max_tweets', 500)
         include_retweets = self.twitter_config.get('include_retweets', False)
@@ -77,44 +96,12 @@ class TwitterScraper:
         tweets_per_term = max_tweets // len(search_terms)
         
         try:
-            for term in search_terms:
-                query = term
-                if not include_retweets:
-                    query += " -is:retweet"
-                
-                # Search for recent tweets
-                tweets = tweepy.Paginator(
-                    self.api.search_recent_tweets,
-                    query=query,
-                    tweet_fields=['created_at', 'author_id', 'public_metrics', 'context_annotations'],
-                    max_results=min(100, tweets_per_term),  # Twitter API limit
-                    limit=tweets_per_term // 100 + 1
-                ).flatten(limit=tweets_per_term)
-                
-                for tweet in tweets:
-                    # Extract stock symbols from tweet text
-                    symbols = extract_stock_symbols(tweet.text)
-                    
-                    if symbols:  # Only include tweets mentioning stocks
-                        tweet_data = {
-                            'id': tweet.id,
-                            'text': clean_text(tweet.text),
-                            'created_at': tweet.created_at,
-                            'author_id': tweet.author_id,
-                            'symbols': symbols,
-                            'source': 'twitter'
-                        }
-                        
-                        # Add public metrics if available
-                        if hasattr(tweet, 'public_metrics'):
-                            tweet_data.update({
-                                'retweet_count': tweet.public_metrics.get('retweet_count', 0),
-                                'like_count': tweet.public_metrics.get('like_count', 0),
-                                'reply_count': tweet.public_metrics.get('reply_count', 0),
-                                'quote_count': tweet.public_metrics.get('quote_count', 0)
-                            })
-                        
-                        tweets_data.append(tweet_data)
+            # Search terms are independent requests; tweepy blocks, so run each on its own thread
+            term_tweets = await asyncio.gather(*(
+                asyncio.to_thread(self._scrape_term_tweets, term, tweets_per_term, include_retweets)
+                for term in search_terms
+            ))
+            tweets_data = [tweet_data for tweets in term_tweets for tweet_data in tweets]
             
             logger.info(f"Scraped {len(tweets_data)} tweets")
             return tweets_data
@@ -123,6 +110,44 @@ class TwitterScraper:
             logger.error(f"Error scraping Twitter: {e}")
             return []
     
+    def _scrape_term_tweets(self, term: str, tweets_per_term: int, include_retweets: bool) -> List[Dict[str, Any]]:
+        """Scrape stock-related tweets for one search term, blocking until done."""
+        query = term
+        if not include_retweets:
+            query += " -is:retweet"
+        
+        # Search for recent tweets
+        tweets = tweepy.Paginator(
+            self.api.search_recent_tweets,
+            query=query,
+            tweet_fields=['created_at', 'author_id', 'public_metrics', 'context_annotations'],
+            max_results=min(100, tweets_per_term),  # Twitter API limit
+            limit=tweets_per_term // 100 + 1
+        ).flatten(limit=tweets_per_term)
+        
+        tweets_data = []
+        for tweet in tweets:
+            # Extract stock symbols from tweet text
+            symbols = extract_stock_symbols(tweet.text)
+            
+            if symbols:  # Only include tweets mentioning stocks
+                tweet_data = {
+                    'id': tweet.id,
+                    'text': clean_text(tweet.text),
+                    'created_at': tweet.created_at,
+                    'author_id': tweet.author_id,
+                    'symbols': symbols,
+                    'source': 'twitter'
+                }
+                
+                # Add public metrics if available
+                if hasattr(tweet, 'public_metrics'):
+                    self._add_public_metrics(tweet_data, tweet.public_metrics)
+                
+                tweets_data.append(tweet_data)
+        
+        return tweets_data
+    
     async def search_tweets_by_hashtag(self, hashtag: str, count: int = 100) -> List[Dict[str, Any]]:
         """
         Search tweets by hashtag.
@@ -134,6 +159,10 @@ class TwitterScraper:
         Returns:
             List of tweet data dictionaries
         """
+        return await asyncio.to_thread(self._search_tweets_by_hashtag, hashtag, count)
+    
+    def _search_tweets_by_hashtag(self, hashtag: str, count: int) -> List[Dict[str, Any]]:
+        """Search tweets by hashtag, blocking until done."""
         if not self.api:
             return []
         
@@ -162,12 +191,7 @@ class TwitterScraper:
                 }
                 
                 if hasattr(tweet, 'public_metrics'):
-                    tweet_data.update({
-                        'retweet_count': tweet.public_metrics.get('retweet_count', 0),
-                        'like_count': tweet.public_metrics.get('like_count', 0),
-                        'reply_count': tweet.public_metrics.get('reply_count', 0),
-                        'quote_count': tweet.public_metrics.get('quote_count', 0)
-                    })
+                    self._add_public_metrics(tweet_data, tweet.public_metrics)
                 
                 tweets_data.append(tweet_data)
             
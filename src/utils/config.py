@@ -4,18 +4,22 @@ Configuration management for the stock sentiment analysis project.
 
 import os
 import yaml
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+CONFIG_PATH = Path("config/settings.yaml")
+
 
 class Config:
     """Configuration management class."""
     
     def __init__(self):
-        self.config_path = Path("config/settings.yaml")
+        self.config_path = CONFIG_PATH
         self.config = self._load_config()
         
     def _load_config(self):
@@ -98,3 +102,18 @@ class Config:
     def database_url(self):
         """Get database URL."""
         return os.getenv('DATABASE_URL', 'sqlite:///data/stock_sentiment.db')
+
+
+@lru_cache(maxsize=1)
+def _load_shared_config(mtime_ns: Optional[int]) -> Config:
+    """Load the configuration for one version of settings.yaml."""
+    return Config()
+
+
+def get_config() -> Config:
+    """Get the shared configuration, reloading it only when settings.yaml changes."""
+    try:
+        mtime_ns = CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _load_shared_config(mtime_ns)
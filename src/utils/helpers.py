@@ -2,13 +2,41 @@
 Utility functions and helpers for the stock sentiment analysis project.
 """
 
+import os
 import re
+import sys
+import json
 import logging
-from typing import List, Dict, Any
+import dataclasses
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from ..data.models import StockMention
+
 logger = logging.getLogger(__name__)
 
+# Stock symbols like $AAPL, $TSLA, etc., in either case
+SYMBOL_PATTERN = re.compile(r'\$([A-Za-z]{1,5})')
+
+# URLs as one character class: '!' plus the ASCII range '$'-'_' and lowercase letters cover
+# every character (and %-escape) the URL alternation used to spell out
+URL_PATTERN = re.compile(r'http[s]?://[!$-_a-z]+')
+
+# Mentions and hashtags
+MENTION_PATTERN = re.compile(r'@\w+|#\w+')
+
+# Texts whose extracted symbols are remembered; the hot and top listings share many posts
+SYMBOL_CACHE_SIZE = 8192
+
 
 def extract_stock_symbols(text: str) -> List[str]:
     """
@@ -20,10 +48,22 @@ def extract_stock_symbols(text: str) -> List[str]:
     Returns:
         List of stock symbols found
     """
-    # Pattern to match stock symbols like $AAPL, $TSLA, etc.
-    pattern = r'\$([A-Z]{1,5})'
-    symbols = re.findall(pattern, text.upper())
-    return list(set(symbols))  # Remove duplicates
+    # Link posts have no body; skip the regex engine entirely
+    if not text:
+        return []
+    
+    # A fresh list per call, so callers can't alter the cached result
+    return list(_extract_unique_symbols(text))
+
+
+@lru_cache(maxsize=SYMBOL_CACHE_SIZE)
+def _extract_unique_symbols(text: str) -> tuple:
+    """Extract the unique stock symbols of a text, in first-seen order."""
+    # Uppercase only the matches rather than copying the whole text
+    symbols = [sys.intern(symbol.upper()) for symbol in SYMBOL_PATTERN.findall(text)]
+    
+    # Interned tickers share one string across posts
+    return tuple(dict.fromkeys(symbols))
 
 
 def clean_text(text: str) -> str:
@@ -36,16 +76,17 @@ def clean_text(text: str) -> str:
     Returns:
         Cleaned text
     """
+    if not text:
+        return ''
+    
     # Remove URLs
-    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = URL_PATTERN.sub('', text)
     
     # Remove mentions and hashtags for cleaner sentiment analysis
-    text = re.sub(r'@\w+|#\w+', '', text)
-    
-    # Remove extra whitespace
-    text = ' '.join(text.split())
+    text = MENTION_PATTERN.sub('', text)
     
-    return text.strip()
+    # Remove extra whitespace; joining the split words leaves nothing to strip at either end
+    return ' '.join(text.split())
 
 
 def get_time_window(hours: int = 24) -> datetime:
@@ -71,13 +112,13 @@ def validate_api_credentials(credentials: Dict[str, Any]) -> bool:
     Returns:
         True if all required credentials are present
     """
-    required_keys = [key for key, value in credentials.items() if value is None]
-    
-    if required_keys:
-        logger.warning(f"Missing API credentials: {required_keys}")
-        return False
+    # Credentials are strings, so the C-level membership test stops at the first None
+    if None not in credentials.values():
+        return True
     
-    return True
+    missing_keys = [key for key, value in credentials.items() if value is None]
+    logger.warning("Missing API credentials: %s", missing_keys)
+    return False
 
 
 def calculate_sentiment_score(positive: float, negative: float, neutral: float) -> float:
@@ -100,28 +141,52 @@ def calculate_sentiment_score(positive: float, negative: float, neutral: float)
     return (positive - negative) / total
 
 
+def calculate_sentiment_score_batch(positive: np.ndarray, negative: np.ndarray,
+                                    neutral: np.ndarray) -> np.ndarray:
+    """
+    Calculate normalized sentiment scores for many items at once.
+    
+    Args:
+        positive: Positive sentiment scores
+        negative: Negative sentiment scores
+        neutral: Neutral sentiment scores
+        
+    Returns:
+        Array of normalized sentiment scores between -1 and 1, 0 where all three scores are 0
+    """
+    positive = np.asarray(positive, dtype=np.float64)
+    negative = np.asarray(negative, dtype=np.float64)
+    total = positive + negative + np.asarray(neutral, dtype=np.float64)
+    
+    has_total = total != 0
+    return np.where(has_total, (positive - negative) / np.where(has_total, total, 1.0), 0.0)
+
+
+# Data and log directories created by setup_directories
+DATA_DIRECTORIES = ('data/raw', 'data/processed', 'data/results', 'logs')
+
+# Set once setup_directories has run in this process
+_directories_ready = False
+
+
 def setup_directories():
-    """Create necessary directories if they don't exist."""
-    import os
-    
-    directories = [
-        'data/raw',
-        'data/processed', 
-        'data/results',
-        'logs'
-    ]
-    
-    for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+    """Create necessary directories if they don't exist, once per process."""
+    global _directories_ready
+    if _directories_ready:
+        return
+    
+    for directory in DATA_DIRECTORIES:
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
         
         # Create .gitkeep files for empty directories
-        gitkeep_path = os.path.join(directory, '.gitkeep')
-        if not os.path.exists(gitkeep_path):
-            with open(gitkeep_path, 'w') as f:
-                f.write('')
+        (path / '.gitkeep').touch(exist_ok=True)
+    
+    _directories_ready = True
 
 
-def format_stock_mention(symbol: str, mentions: int, sentiment: float) -> Dict[str, Any]:
+def format_stock_mention(symbol: str, mentions: int, sentiment: float,
+                         timestamp: Optional[str] = None) -> StockMention:
     """
     Format stock mention data for consistent storage.
     
@@ -129,13 +194,74 @@ def format_stock_mention(symbol: str, mentions: int, sentiment: float) -> Dict[s
         symbol: Stock symbol
         mentions: Number of mentions
         sentiment: Average sentiment score
+        timestamp: ISO timestamp to stamp the mention with; pass one shared value when
+            formatting many mentions to read the clock once. Defaults to now.
+        
+    Returns:
+        Formatted stock mention record
+    """
+    return StockMention(
+        symbol.upper(),
+        mentions,
+        round(sentiment, 4),
+        timestamp if timestamp is not None else datetime.now().isoformat()
+    )
+
+
+def dump_json(data: Any, path: Union[str, Path]) -> None:
+    """
+    Write data to a JSON file, using orjson when it is installed.
+    
+    Args:
+        data: JSON-serializable object or dataclass instance
+        path: Destination file path
+    """
+    if orjson:
+        Path(path).write_bytes(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, default=_json_default)
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize dataclasses and numpy scalars for the stdlib json fallback, as orjson does natively."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """
+    Read a JSON file, using orjson when it is installed.
+    
+    Args:
+        path: Source file path
         
     Returns:
-        Formatted stock mention dictionary
-    """
-    return {
-        'symbol': symbol.upper(),
-        'mentions': mentions,
-        'sentiment_score': round(sentiment, 4),
-        'timestamp': datetime.now().isoformat()
-    }
+        Parsed JSON object
+    """
+    if orjson:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def scan_daily_results(results_dir: Union[str, Path]) -> List[os.DirEntry]:
+    """
+    List daily analysis_*.json result files with a single directory scan.
+    
+    Args:
+        results_dir: Directory holding the daily result files
+        
+    Returns:
+        Directory entries sorted by file name, i.e. by date
+    """
+    with os.scandir(results_dir) as it:
+        entries = [entry for entry in it
+                   if entry.name.startswith('analysis_') and entry.name.endswith('.json')]
+    entries.sort(key=lambda entry: entry.name)
+    return entries
@@ -21,91 +21,99 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 
+# Mock payloads are built once at import, all stamped with the same time
+MOCK_NOW = datetime.now()
+
+MOCK_REDDIT_POSTS = (
+    {
+        'id': 'post1',
+        'title': 'YOLO into $AAPL calls! 🚀🚀🚀',
+        'text': 'Apple is going to the moon! Diamond hands! This is the way!',
+        'score': 1500,
+        'upvote_ratio': 0.85,
+        'num_comments': 200,
+        'created_utc': MOCK_NOW,
+        'author': 'test_user1',
+        'symbols': ['AAPL'],
+        'url': 'https://reddit.com/test1',
+        'source': 'reddit'
+    },
+    {
+        'id': 'post2', 
+        'title': '$TSLA puts printing! 📉',
+        'text': 'Tesla is overvalued, time to short. Paper hands selling.',
+        'score': 800,
+        'upvote_ratio': 0.65,
+        'num_comments': 150,
+        'created_utc': MOCK_NOW,
+        'author': 'test_user2',
+        'symbols': ['TSLA'],
+        'url': 'https://reddit.com/test2',
+        'source': 'reddit'
+    },
+    {
+        'id': 'post3',
+        'title': '$SPY and $QQQ looking bullish',
+        'text': 'Market is strong, buying calls on both. Bull market continues!',
+        'score': 2200,
+        'upvote_ratio': 0.92,
+        'num_comments': 300,
+        'created_utc': MOCK_NOW,
+        'author': 'test_user3',
+        'symbols': ['SPY', 'QQQ'],
+        'url': 'https://reddit.com/test3',
+        'source': 'reddit'
+    }
+)
+
+MOCK_TWEETS = (
+    {
+        'id': 'tweet1',
+        'text': 'Just bought more $AAPL shares! This company is unstoppable 🚀',
+        'created_at': MOCK_NOW,
+        'author_id': 'twitter_user1',
+        'symbols': ['AAPL'],
+        'like_count': 150,
+        'retweet_count': 25,
+        'reply_count': 10,
+        'quote_count': 5,
+        'source': 'twitter'
+    },
+    {
+        'id': 'tweet2',
+        'text': '$TSLA is crashing hard today. Glad I sold my calls yesterday.',
+        'created_at': MOCK_NOW,
+        'author_id': 'twitter_user2', 
+        'symbols': ['TSLA'],
+        'like_count': 89,
+        'retweet_count': 12,
+        'reply_count': 8,
+        'quote_count': 2,
+        'source': 'twitter'
+    },
+    {
+        'id': 'tweet3',
+        'text': '$SPY breaking resistance! New all-time highs incoming 📈',
+        'created_at': MOCK_NOW,
+        'author_id': 'twitter_user3',
+        'symbols': ['SPY'],
+        'like_count': 200,
+        'retweet_count': 45,
+        'reply_count': 15,
+        'quote_count': 8,
+        'source': 'twitter'
+    }
+)
+
+
 def create_mock_reddit_data():
     """Create mock Reddit data for testing."""
-    return [
-        {
-            'id': 'post1',
-            'title': 'YOLO into $AAPL calls! 🚀🚀🚀',
-            'text': 'Apple is going to the moon! Diamond hands! This is the way!',
-            'score': 1500,
-            'upvote_ratio': 0.85,
-            'num_comments': 200,
-            'created_utc': datetime.now(),
-            'author': 'test_user1',
-            'symbols': ['AAPL'],
-            'url': 'https://reddit.com/test1',
-            'source': 'reddit'
-        },
-        {
-            'id': 'post2', 
-            'title': '$TSLA puts printing! 📉',
-            'text': 'Tesla is overvalued, time to short. Paper hands selling.',
-            'score': 800,
-            'upvote_ratio': 0.65,
-            'num_comments': 150,
-            'created_utc': datetime.now(),
-            'author': 'test_user2',
-            'symbols': ['TSLA'],
-            'url': 'https://reddit.com/test2',
-            'source': 'reddit'
-        },
-        {
-            'id': 'post3',
-            'title': '$SPY and $QQQ looking bullish',
-            'text': 'Market is strong, buying calls on both. Bull market continues!',
-            'score': 2200,
-            'upvote_ratio': 0.92,
-            'num_comments': 300,
-            'created_utc': datetime.now(),
-            'author': 'test_user3',
-            'symbols': ['SPY', 'QQQ'],
-            'url': 'https://reddit.com/test3',
-            'source': 'reddit'
-        }
-    ]
+    return [dict(post) for post in MOCK_REDDIT_POSTS]
 
 
 def create_mock_twitter_data():
     """Create mock Twitter data for testing."""
-    return [
-        {
-            'id': 'tweet1',
-            'text': 'Just bought more $AAPL shares! This company is unstoppable 🚀',
-            'created_at': datetime.now(),
-            'author_id': 'twitter_user1',
-            'symbols': ['AAPL'],
-            'like_count': 150,
-            'retweet_count': 25,
-            'reply_count': 10,
-            'quote_count': 5,
-            'source': 'twitter'
-        },
-        {
-            'id': 'tweet2',
-            'text': '$TSLA is crashing hard today. Glad I sold my calls yesterday.',
-            'created_at': datetime.now(),
-            'author_id': 'twitter_user2', 
-            'symbols': ['TSLA'],
-            'like_count': 89,
-            'retweet_count': 12,
-            'reply_count': 8,
-            'quote_count': 2,
-            'source': 'twitter'
-        },
-        {
-            'id': 'tweet3',
-            'text': '$SPY breaking resistance! New all-time highs incoming 📈',
-            'created_at': datetime.now(),
-            'author_id': 'twitter_user3',
-            'symbols': ['SPY'],
-            'like_count': 200,
-            'retweet_count': 45,
-            'reply_count': 15,
-            'quote_count': 8,
-            'source': 'twitter'
-        }
-    ]
+    return [dict(tweet) for tweet in MOCK_TWEETS]
 
 
 async def test_sentiment_analysis():
@@ -2,12 +2,18 @@
 Tests for the analysis modules.
 """
 
+import json
+import sqlite3
+
 import pytest
+import pandas as pd
 from unittest.mock import Mock
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from src.analysis.backtester import SentimentBacktester
 from src.analysis.sentiment_analyzer import SentimentAnalyzer
 from src.analysis.stock_ranker import StockRanker
+from sentiment_price_analyzer import SentimentPriceAnalyzer
 
 
 class TestSentimentAnalyzer:
@@ -145,5 +151,99 @@ class TestStockRanker:
         assert rankings[0]['rank'] == 1
 
 
+class TestSentimentBacktester:
+    """Test cases for sentiment backtester."""
+    
+    def test_forward_returns(self, tmp_path):
+        """Test that forward returns compare future closes with today's close."""
+        backtester = SentimentBacktester(str(tmp_path / 'backtest.db'))
+        closes = pd.DataFrame({'AAPL': [100.0, 110.0, 121.0, 133.1, 146.41]},
+                              index=pd.date_range('2024-01-02', periods=5, freq='B'))
+        backtester.price_cache = Mock(get_close_prices=Mock(return_value=closes))
+        
+        hist = backtester.get_stock_price_data(['AAPL'])['AAPL']
+        
+        assert hist['Forward_1d_Return'].iloc[0] == pytest.approx(0.1)
+        assert hist['Forward_3d_Return'].iloc[0] == pytest.approx(0.331)
+        assert hist['Forward_3d_Return'].iloc[1] == pytest.approx(0.331)
+        assert hist['Forward_3d_Return'].iloc[2:].isna().all()
+        assert hist['Forward_7d_Return'].isna().all()
+    
+    def test_forward_returns_skip_missing_days(self, tmp_path):
+        """Test that forward returns follow each symbol's own trading days."""
+        backtester = SentimentBacktester(str(tmp_path / 'backtest.db'))
+        closes = pd.DataFrame({'AAPL': [100.0, 101.0, 102.0, 103.0, 104.0],
+                               'XYZ': [10.0, float('nan'), 11.0, 12.0, 13.0]},
+                              index=pd.date_range('2024-01-02', periods=5, freq='B'))
+        backtester.price_cache = Mock(get_close_prices=Mock(return_value=closes))
+        
+        hist = backtester.get_stock_price_data(['AAPL', 'XYZ'])['XYZ']
+        
+        assert len(hist) == 4
+        assert hist['Forward_1d_Return'].iloc[0] == pytest.approx(0.1)
+        assert hist['Forward_3d_Return'].iloc[0] == pytest.approx(0.3)
+        assert hist['Daily_Return'].iloc[1] == pytest.approx(0.1)
+    
+    def test_confidence_analysis_keeps_score_precision(self, tmp_path):
+        """Test that reported confidence averages are not rounded through single precision."""
+        backtester = SentimentBacktester(str(tmp_path / 'backtest.db'))
+        closes = pd.DataFrame({'AAPL': [100.0, 110.0, 121.0, 133.1, 146.41]},
+                              index=pd.date_range('2024-01-02', periods=5, freq='B'))
+        backtester.price_cache = Mock(get_close_prices=Mock(return_value=closes))
+        sentiment_df = pd.DataFrame({'symbol': ['AAPL', 'AAPL'],
+                                     'date': pd.to_datetime(['2024-01-02', '2024-01-03']),
+                                     'composite_sentiment': [0.5, 0.4],
+                                     'confidence_score': [0.8, 0.8]})
+        
+        predictions = backtester.match_predictions(sentiment_df, backtester.get_stock_price_data(['AAPL']))
+        analysis = backtester.analyze_confidence_correlation(predictions)
+        
+        assert analysis['High']['avg_confidence'] == 0.8
+        assert analysis['High']['count'] == 2
+
+
+
+class TestSentimentPriceAnalyzer:
+    """Test cases for the sentiment vs price analyzer."""
+    
+    def make_analyzer(self, tmp_path):
+        """Build an analyzer whose price cache returns a week of closes ending today."""
+        analyzer = SentimentPriceAnalyzer(str(tmp_path / 'sentiment.db'), str(tmp_path / 'daily_results'))
+        index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=7, freq='D')
+        closes = pd.DataFrame({'AAPL': [100.0, 101.0, 102.0, 103.0, 104.0, 105.0, 106.0]}, index=index)
+        analyzer.price_cache = Mock(get_close_prices=Mock(return_value=closes))
+        return analyzer
+    
+    def test_correlation_with_database_data_only(self, tmp_path):
+        """Test matching prices when only the database has sentiment."""
+        analyzer = self.make_analyzer(tmp_path)
+        analyzer._conn.execute(
+            'CREATE TABLE symbol_sentiment_history (symbol TEXT, sentiment_compound REAL, '
+            'mentions INTEGER, created_at TIMESTAMP)'
+        )
+        created_at = (datetime.now() - timedelta(days=3)).strftime('%Y-%m-%d %H:%M:%S')
+        analyzer._conn.execute('INSERT INTO symbol_sentiment_history VALUES (?, ?, ?, ?)',
+                               ('AAPL', 0.5, 10, created_at))
+        
+        analysis = analyzer.analyze_sentiment_price_correlation(days_back=14)
+        
+        assert [result['symbol'] for result in analysis['results']] == ['AAPL']
+        assert analysis['total_predictions']['1d'] == 1
+    
+    def test_correlation_with_json_data_only(self, tmp_path):
+        """Test matching prices when only the daily JSON results have sentiment."""
+        analyzer = self.make_analyzer(tmp_path)
+        analyzer.results_dir.mkdir()
+        day = datetime.now() - timedelta(days=3)
+        rankings = {'top_rankings': [{'symbol': 'AAPL', 'composite_sentiment': 0.5, 'total_mentions': 10,
+                                      'confidence_score': 0.8, 'composite_score': 0.6}]}
+        (analyzer.results_dir / f"analysis_{day.strftime('%Y%m%d')}.json").write_text(json.dumps(rankings))
+        
+        analysis = analyzer.analyze_sentiment_price_correlation(days_back=14)
+        
+        assert [result['symbol'] for result in analysis['results']] == ['AAPL']
+        assert analysis['total_predictions']['1d'] == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,91 @@
+"""
+Tests for the data modules.
+"""
+
+import pytest
+import pandas as pd
+from unittest.mock import patch
+
+from src.data.price_cache import PriceCache
+
+
+def make_download(symbols, start='2024-01-02', end=None, days=5, **kwargs):
+    """Build a yf.download-shaped frame grouped by ticker, over [start, end) or `days` business days."""
+    if end is None:
+        index = pd.date_range(start, periods=days, freq='B')
+    else:
+        index = pd.date_range(start, end, freq='B', inclusive='left')
+    columns = pd.MultiIndex.from_product([symbols, ['Open', 'Close']])
+    return pd.DataFrame(1.0, index=index, columns=columns)
+
+
+class TestPriceCache:
+    """Test cases for the price cache."""
+    
+    @patch('src.data.price_cache.yf')
+    def test_get_close_prices_downloads_once(self, mock_yf, tmp_path):
+        """Test that a second request is served from the cache."""
+        mock_yf.download.return_value = make_download(['AAPL', 'TSLA'])
+        cache = PriceCache(str(tmp_path / 'prices.db'))
+        
+        closes = cache.get_close_prices(['AAPL', 'TSLA'], '2024-01-01', '2024-01-10')
+        assert list(closes.columns) == ['AAPL', 'TSLA']
+        assert len(closes) == 5
+        
+        closes = cache.get_close_prices(['AAPL', 'TSLA'], '2024-01-01', '2024-01-10')
+        assert len(closes) == 5
+        assert mock_yf.download.call_count == 1
+    
+    @patch('src.data.price_cache.yf')
+    def test_get_close_prices_fetches_only_missing(self, mock_yf, tmp_path):
+        """Test that only uncached symbols are downloaded."""
+        cache = PriceCache(str(tmp_path / 'prices.db'))
+        mock_yf.download.return_value = make_download(['AAPL'])
+        cache.get_close_prices(['AAPL'], '2024-01-01', '2024-01-10')
+        
+        mock_yf.download.return_value = make_download(['TSLA'])
+        closes = cache.get_close_prices(['AAPL', 'TSLA'], '2024-01-01', '2024-01-10')
+        
+        assert mock_yf.download.call_args[0][0] == ['TSLA']
+        assert set(closes.columns) == {'AAPL', 'TSLA'}
+    
+    @patch('src.data.price_cache.yf')
+    def test_get_close_prices_fetches_only_missing_tail(self, mock_yf, tmp_path):
+        """Test that a longer window only downloads from the last cached day."""
+        cache = PriceCache(str(tmp_path / 'prices.db'))
+        mock_yf.download.return_value = make_download(['AAPL'])
+        cache.get_close_prices(['AAPL'], '2024-01-01', '2024-01-10')
+        
+        mock_yf.download.return_value = make_download(['AAPL'], days=8)
+        closes = cache.get_close_prices(['AAPL'], '2024-01-01', '2024-01-17')
+        
+        assert mock_yf.download.call_args[1]['start'] == '2024-01-08'
+        assert len(closes) == 8
+    
+    @patch('src.data.price_cache.yf')
+    def test_get_close_prices_refetches_window_after_gap(self, mock_yf, tmp_path):
+        """Test that a window starting after the cached days does not record the gap as covered."""
+        cache = PriceCache(str(tmp_path / 'prices.db'))
+        mock_yf.download.side_effect = make_download
+        cache.get_close_prices(['AAPL'], '2024-01-01', '2024-01-31')
+        cache.get_close_prices(['AAPL'], '2024-03-01', '2024-03-31')
+        
+        closes = cache.get_close_prices(['AAPL'], '2024-01-01', '2024-03-31')
+        
+        assert mock_yf.download.call_count == 3
+        assert len(closes.loc['2024-02']) == 21
+    
+    @patch('src.data.price_cache.yf')
+    def test_get_close_prices_includes_end_date(self, mock_yf, tmp_path):
+        """Test that the bar on the end date is downloaded and returned."""
+        cache = PriceCache(str(tmp_path / 'prices.db'))
+        mock_yf.download.return_value = make_download(['AAPL'])
+        closes = cache.get_close_prices(['AAPL'], '2024-01-01', '2024-01-08')
+        
+        assert mock_yf.download.call_args[1]['end'] == '2024-01-09'
+        assert closes.index[-1] == pd.Timestamp('2024-01-08')
+        assert len(closes) == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -4,11 +4,37 @@ Weekly Comprehensive Analysis Report
 Combines sentiment analysis, backtesting, and price correlation
 """
 
+import os
 import subprocess
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Report sections as (title, rule width, command), grouped into jobs that run concurrently.
+# Commands within a job run in order: both correlation runs save the same dated results file,
+# and the 14-day run must write it last.
+REPORT_JOBS = [
+    [("1️⃣ HISTORICAL SENTIMENT TRENDS", 40, ["python", "historical_analyzer.py", "--patterns"])],
+    [("2️⃣ STOCK TRENDING ANALYSIS", 40, ["python", "historical_analyzer.py", "--trends"])],
+    [("3️⃣ SENTIMENT VS PRICE CORRELATION (7 days)", 50, ["python", "sentiment_price_analyzer.py", "--days", "7"]),
+     ("4️⃣ EXTENDED PRICE CORRELATION (14 days)", 50, ["python", "sentiment_price_analyzer.py", "--days", "14"])],
+    [("5️⃣ BACKTESTING VALIDATION", 30, ["python", "demo_backtesting.py"])],
+    [("6️⃣ WEEKLY DATA SUMMARY", 30, ["python", "automated_daily_runner.py", "--summary"])],
+]
+
+# Captured output is piped, so tell the child interpreters to write UTF-8 regardless of locale
+CHILD_ENV = {**os.environ, 'PYTHONIOENCODING': 'utf-8'}
+
+
+def run_report_job(job):
+    """Run a job's commands in order, returning each command's combined stdout and stderr"""
+    return [
+        subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                       text=True, encoding='utf-8', env=CHILD_ENV).stdout
+        for _, _, command in job
+    ]
+
 def run_weekly_comprehensive_analysis():
     """Generate a comprehensive weekly analysis report"""
     print("📊 WEEKLY COMPREHENSIVE ANALYSIS REPORT")
@@ -16,40 +42,18 @@ def run_weekly_comprehensive_analysis():
     print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
-    # 1. Historical sentiment analysis
-    print("1️⃣ HISTORICAL SENTIMENT TRENDS")
-    print("-" * 40)
-    subprocess.run(["python", "historical_analyzer.py", "--patterns"])
-    print()
-    
-    # 2. Stock trending analysis
-    print("2️⃣ STOCK TRENDING ANALYSIS")
-    print("-" * 40)
-    subprocess.run(["python", "historical_analyzer.py", "--trends"])
-    print()
-    
-    # 3. Sentiment vs Price Correlation (7 days)
-    print("3️⃣ SENTIMENT VS PRICE CORRELATION (7 days)")
-    print("-" * 50)
-    subprocess.run(["python", "sentiment_price_analyzer.py", "--days", "7"])
-    print()
-    
-    # 4. Extended Price Correlation (14 days)
-    print("4️⃣ EXTENDED PRICE CORRELATION (14 days)")
-    print("-" * 50) 
-    subprocess.run(["python", "sentiment_price_analyzer.py", "--days", "14"])
-    print()
-    
-    # 5. Backtesting validation
-    print("5️⃣ BACKTESTING VALIDATION")
-    print("-" * 30)
-    subprocess.run(["python", "demo_backtesting.py"])
-    print()
+    # Run independent analyses concurrently, then print their output in report order
+    sections = [section for job in REPORT_JOBS for section in job]
+    with ThreadPoolExecutor(max_workers=len(REPORT_JOBS)) as executor:
+        outputs = [output for job_outputs in executor.map(run_report_job, REPORT_JOBS)
+                   for output in job_outputs]
     
-    # 6. Weekly summary
-    print("6️⃣ WEEKLY DATA SUMMARY")
-    print("-" * 30)
-    subprocess.run(["python", "automated_daily_runner.py", "--summary"])
+    for i, ((title, rule_width, _), output) in enumerate(zip(sections, outputs), start=1):
+        print(title)
+        print("-" * rule_width)
+        print(output, end='')
+        if i < len(sections):
+            print()
     
     print("\n" + "=" * 80)
     print("✅ WEEKLY COMPREHENSIVE ANALYSIS COMPLETE")